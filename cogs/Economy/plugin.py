@@ -1,20 +1,19 @@
 from __future__ import annotations
 
-from logging import log
+from logging import getLogger
 import os
 import asyncio
 import discord
 import random
 from PIL import Image
 from io import BytesIO
-from concurrent.futures import ThreadPoolExecutor
 import requests
-from core import Bot, EconomyModel, ObjektModel, CollectionModel, CooldownModel, ShopModel, PityModel
-from core.constants import SEASON_CHOICES, BANNER_CHOICES, RARITY_COMO_REWARDS, RARITY_STR_MAPPING, RARITY_TIERS, SHOP_BUY_VALUES, SORT_CHOICES, CLASS_CHOICES, RARITY_CHOICES
+from core import Bot, EconomyModel, ObjektModel, ObjektRecord, CollectionModel, PityModel, rate_limit
+from core.constants import SEASON_CHOICES, BANNER_CHOICES, SPIN_COUNT_CHOICES, RARITY_COMO_REWARDS, RARITY_STR_MAPPING, RARITY_TIERS, SHOP_BUY_VALUES, SORT_CHOICES, CLASS_CHOICES, RARITY_CHOICES
 from tortoise.exceptions import DoesNotExist
-from tortoise.transactions import in_transaction
 from tortoise.expressions import Q
 from tortoise.functions import Max
+from collections import Counter
 from datetime import datetime, timedelta, tzinfo, timezone, time
 import aiohttp
 from .. import Plugin
@@ -24,6 +23,15 @@ from discord.ui import View, Button
 
 __all__ = ("update_user_balance", "add_objekt_to_user")
 
+log = getLogger(__name__)
+
+# discord rejects embed descriptions longer than this
+EMBED_DESCRIPTION_LIMIT = 4096
+
+def spin_cost(interaction: discord.Interaction) -> int:
+    # multi-spins cost the same cooldown as doing them one at a time
+    return getattr(interaction.namespace, "count", None) or 1
+
 class EconomyPlugin(Plugin):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
@@ -32,7 +40,9 @@ class EconomyPlugin(Plugin):
 
     @tasks.loop(time=time(hour=0, minute=0, tzinfo=timezone.utc))
     async def refresh_shop_task(self):
-        await self.refresh_shop()
+        # lazy shops roll over on their own when the UTC date changes
+        if not self.bot.shop.lazy:
+            await self.refresh_shop()
     
     @refresh_shop_task.before_loop
     async def before_refresh_shop_task(self):
@@ -44,47 +54,25 @@ class EconomyPlugin(Plugin):
         except DoesNotExist:
             return await EconomyModel.create(id=id)
     
-    async def get_cooldown(self, user_id: int, command: str):
-        return await CooldownModel.filter(user_id=user_id, command=command).first()
+    async def get_cooldown(self, user_id: int, command: str) -> datetime | None:
+        return await self.bot.cooldowns.get(user_id, command)
 
     async def set_cooldown(self, user_id: int, command: str, expires_at: datetime):
-        cooldown = await self.get_cooldown(user_id, command)
-        if cooldown:
-            cooldown.expires_at = expires_at
-            await cooldown.save()
-        else:
-            await CooldownModel.create(user_id=user_id, command=command, expires_at=expires_at)
+        await self.bot.cooldowns.set(user_id, command, expires_at)
 
-    async def update_user_balance(self, user_id: int, amount: int):
-        user_data = await self.get_user_data(id=user_id)
-        user_data.balance += amount
-        await user_data.save()
+    async def update_user_balance(self, user_id: int, amount: int) -> int:
+        return await self.bot.ledger.credit(user_id, amount)
 
     async def get_random_objekt_by_rarity(self, rarity: int):
-        objekt_ids = await ObjektModel.filter(rarity=rarity).values_list("id", flat=True)
-        if not objekt_ids:
-            return None
-        random_objekt_id = random.choice(objekt_ids)
-        return await ObjektModel.get(id=random_objekt_id)
-
-    async def add_objekt_to_user(self, user_id: int, objekt: ObjektModel):
-        async with in_transaction():
-            collection_entry = await CollectionModel.filter(user_id=str(user_id), objekt_id=objekt.id).first()
-            if collection_entry:
-                collection_entry.copies += 1
-                await collection_entry.save()
-            else:
-                await CollectionModel.create(user_id=str(user_id), objekt_id=objekt.id, copies=1)
+        return self.bot.catalog.random_by_rarity(rarity)
+
+    async def add_objekt_to_user(self, user_id: int, objekt: ObjektModel | ObjektRecord) -> int:
+        return await self.bot.inventory.add(user_id, objekt.id)
 
     async def get_ready_commands(self, user_id: int, now: datetime, commands: list[str]):
-        reminders = []
-        for command in commands:
-            cooldown = await self.get_cooldown(user_id, command)
-            if not cooldown or cooldown.expires_at <= now:
-                reminders.append(command.capitalize())
-        return reminders
-
-    def create_daily_reward_embed(self, como_amount: int, objekt: ObjektModel, reminders: list[str]):
+        return await self.bot.cooldowns.ready(user_id, now, commands)
+
+    def create_daily_reward_embed(self, como_amount: int, objekt: ObjektRecord, reminders: list[str]):
         color = int(objekt.background_color.replace("#", ""), 16) if objekt.background_color else 0xFF69B4
         embed = discord.Embed(
             title="Daily Reward!",
@@ -104,7 +92,7 @@ class EconomyPlugin(Plugin):
         hours, minutes = divmod(minutes, 60)
         return f"{int(hours)}h {int(minutes)}m"
 
-    def create_weekly_reward_embed(self, como_amount: int, objekt: ObjektModel, reminders: list[str]):
+    def create_weekly_reward_embed(self, como_amount: int, objekt: ObjektRecord, reminders: list[str]):
         color = int(objekt.background_color.replace("#", ""), 16) if objekt.background_color else 0xFF69B4
         embed = discord.Embed(
             title="Weekly Reward!",
@@ -119,136 +107,87 @@ class EconomyPlugin(Plugin):
             embed.set_footer(text=f"Reminder: {', '.join(reminders)} command(s) are ready!")
         return embed
 
-    async def get_objekt_ids_for_banner(self, rarity_choice: int, banner: str | None):
-        if banner == "rateup":
-            return await self.handle_rateup_banner(rarity_choice)
-        elif banner:
-            return await self.handle_specific_banner(rarity_choice, banner)
-        else:
-            return await ObjektModel.filter(rarity=rarity_choice).values_list("id", flat=True)
-
-    async def handle_rateup_banner(self, rarity_choice: int):
-        if rarity_choice == 1:
-            sub_rarity = ["Binary02", "GNDSG01"]
-            sub_weights = [0.3, 0.7]
-            season_choice = await self.rarity_choice(sub_rarity, sub_weights)
-            return await ObjektModel.filter(season=season_choice, rarity=rarity_choice).values_list("id", flat=True)
-        else:
-            return await ObjektModel.filter(Q(season="Binary02"), rarity=rarity_choice).values_list("id", flat=True)
-
-    async def handle_specific_banner(self, rarity_choice: int, banner: str):
-        if rarity_choice == 1:
-            sub_rarity = [banner, "GNDSG01"]
-            sub_weights = [0.3, 0.7]
-            season_choice = await self.rarity_choice(sub_rarity, sub_weights)
-            return await ObjektModel.filter(season=season_choice, rarity=rarity_choice).values_list("id", flat=True)
-        else:
-            return await ObjektModel.filter(season=banner, rarity=rarity_choice).values_list("id", flat=True)
-
-    async def handle_pity(self, user_id: int, ids: list[int], pity_entry: PityModel, banner: str | None, rarity_choice: int):
-        if pity_entry.chase_objekt_slug:
-            card, pity_taken = await self.handle_chase_pity(user_id, ids, pity_entry)
-            if card:
-                return card, pity_taken
-
-        return await self.handle_general_pity(user_id, ids, pity_entry, banner, rarity_choice)
-
-    async def handle_chase_pity(self, user_id: int, ids: list[int], pity_entry: PityModel):
-        chase_objekt = await ObjektModel.filter(slug=pity_entry.chase_objekt_slug).first()
-        if chase_objekt and chase_objekt.id in ids:
-            random_id = random.choice(ids)
-            card = await ObjektModel.get(id=random_id)
-
-            if card.id == chase_objekt.id:
-                return await self.reset_chase_pity(user_id, card, pity_entry)
-
-        pity_entry.chase_pity_count += 1
-        if pity_entry.chase_pity_count >= 250:
-            return await self.reset_chase_pity(user_id, chase_objekt, pity_entry)
-
-        await pity_entry.save()
-        return None, None
-
-    async def reset_chase_pity(self, user_id: int, card: ObjektModel, pity_entry: PityModel):
-        pity_taken = pity_entry.chase_pity_count
-        pity_entry.chase_pity_count = 0
-        pity_entry.chase_objekt_slug = None
-        pity_entry.pity_count = 0
-        await pity_entry.save()
-
-        await self.add_objekt_to_user(user_id, card)
-        return card, pity_taken
-
-    async def handle_general_pity(self, user_id: int, ids: list[int], pity_entry: PityModel, banner: str | None, rarity_choice: int):
-        low_rarities = [1, 2, 3, 4]
-        if rarity_choice in low_rarities:
-            pity_entry.pity_count += 1
-        else:
-            pity_entry.pity_count = 0
-
-        if pity_entry.pity_count >= 80:
-            return await self.reset_general_pity(user_id, pity_entry, banner)
-
-        await pity_entry.save()
-        return None, None
-
-    async def reset_general_pity(self, user_id: int, pity_entry: PityModel, banner: str | None):
-        pity_entry.pity_count = 0
-        owned_ids = await CollectionModel.filter(user_id=user_id).values_list("objekt_id", flat=True)
-
-        if banner:
-            higher_rarity_cards = await ObjektModel.filter(rarity__gte=4, season=banner).exclude(id__in=owned_ids).values_list("id", flat=True)
-        else:
-            higher_rarity_cards = await ObjektModel.filter(rarity__gte=4).exclude(id__in=owned_ids).values_list("id", flat=True)
-
-        if higher_rarity_cards:
-            pity_card_id = random.choice(higher_rarity_cards)
-            pity_card = await ObjektModel.get(id=pity_card_id)
-            await self.add_objekt_to_user(user_id, pity_card)
-            await pity_entry.save()
-            return pity_card, None
-
-        await pity_entry.save()
-        return None, None
-
-    async def select_random_objekt(self, user_id: int, ids: list[int]):
-        random_id = random.choice(ids)
-        card = await ObjektModel.get(id=random_id)
+    async def roll_spins(self, user_id: int, count: int, banner: str | None, pity_entry: PityModel):
+        """Draw `count` spins in memory, applying pity in order. Nothing is persisted here."""
+        pulls = []
+        owned_ids = None
 
-        if not card:
-            return None, None
+        for _ in range(count):
+            card = self.bot.sampler.draw(banner)
+            if not card:
+                break
+            pity_taken = None
+
+            # chase pity
+            if pity_entry.chase_objekt_slug:
+                chase_objekt = self.bot.catalog.get_by_slug(pity_entry.chase_objekt_slug)
+                if chase_objekt and card.id == chase_objekt.id:
+                    pity_taken = pity_entry.chase_pity_count
+                else:
+                    pity_entry.chase_pity_count += 1
+                    if chase_objekt and pity_entry.chase_pity_count >= 250:
+                        pity_taken = pity_entry.chase_pity_count
+
+                if pity_taken is not None:
+                    card = chase_objekt
+                    pity_entry.chase_pity_count = 0
+                    pity_entry.chase_objekt_slug = None
+                    pity_entry.pity_count = 0
+
+            # general pity
+            if pity_taken is None:
+                if card.rarity in (1, 2, 3, 4):
+                    pity_entry.pity_count += 1
+                else:
+                    pity_entry.pity_count = 0
+
+                if pity_entry.pity_count >= 80:
+                    pity_entry.pity_count = 0
+                    if owned_ids is None:
+                        owned_ids = set(await CollectionModel.filter(user_id=user_id).values_list("objekt_id", flat=True))
+                        owned_ids.update(pull.id for pull, _ in pulls)
+                    higher_rarity_cards = [
+                        objekt for rarity in (4, 5, 6) for objekt in self.bot.catalog.with_rarity(rarity, banner)
+                        if objekt.id not in owned_ids
+                    ]
+                    if higher_rarity_cards:
+                        card = random.choice(higher_rarity_cards)
+
+            if owned_ids is not None:
+                owned_ids.add(card.id)
+            pulls.append((card, pity_taken))
+
+        return pulls
+
+    async def give_random_objekts(self, user_id: int, count: int = 1, banner: str | None = None, pity_entry: PityModel | None = None):
+        """Roll `count` spins and persist them in one transaction.
+
+        Returns the pulls as `(card, pity_taken)`, the new copy count per objekt
+        and the como earned.
+        """
+        if pity_entry is None:
+            await self.bot.ledger.ensure(user_id)
+            pity_entry, _ = await PityModel.get_or_create(user_id=user_id)
 
-        await self.add_objekt_to_user(user_id, card)
-        return card, None
+        pulls = await self.roll_spins(user_id, count, banner, pity_entry)
+        if not pulls:
+            return [], {}, 0
 
-    async def rarity_choice(self, rarity, weights):
-        if not rarity:
-            return None
-        return random.choices(rarity, weights=weights)[0]
+        counts = Counter(card.id for card, _ in pulls)
+        como_reward = sum(self.calculate_como_reward(card.rarity) for card, _ in pulls)
 
-    async def give_random_objekt(self, user_id: int, banner: str | None = None, pity_entry: PityModel | None = None):
-        rarity = [6,5,4,3,2,1]
-        weights = [0.003,0.03,0.067,0.1,0.2,0.6]
-        rarity_choice = await self.rarity_choice(rarity, weights)
-        
-        # handle banners
-        ids = await self.get_objekt_ids_for_banner(rarity_choice, banner)
+        async with self.bot.inventory.transaction() as connection:
+            copies = await self.bot.inventory.add_many(user_id, counts, using_db=connection)
+            await pity_entry.save(using_db=connection)
+            await self.bot.ledger.credit(user_id, como_reward, using_db=connection)
 
-        if not ids:
-            return None, None
-        
-        if pity_entry:
-            card, pity_taken = await self.handle_pity(user_id, ids, pity_entry, banner, rarity_choice)
-            if card:
-                return card, pity_taken
-        
-        return await self.select_random_objekt(user_id, ids)
+        return pulls, copies, como_reward
 
-    async def validate_objekt_slug(self, objekt_slug: str) -> ObjektModel | None:
-        return await ObjektModel.filter(slug=objekt_slug).first()
+    async def validate_objekt_slug(self, objekt_slug: str) -> ObjektRecord | None:
+        return self.bot.catalog.get_by_slug(objekt_slug)
 
     async def confirm_chase_change(self, interaction: discord.Interaction, pity_entry: PityModel) -> bool:
-        current_chase = await ObjektModel.filter(slug=pity_entry.chase_objekt_slug).first()
+        current_chase = self.bot.catalog.get_by_slug(pity_entry.chase_objekt_slug)
         current_chase_name = (
             f"{current_chase.member} {current_chase.season[0] * int(current_chase.season[-1])}{current_chase.series}"
             if current_chase else "Unknown"
@@ -303,19 +242,19 @@ class EconomyPlugin(Plugin):
     async def create_spin_embed(
         self,
         user: discord.User,
-        card: ObjektModel,
+        card: ObjektRecord,
         pity_entry: PityModel,
         pity_taken: int | None,
         como_reward: int,
-        reminders: list[str]
+        reminders: list[str],
+        copies: int = 1
     ) -> discord.Embed:
         color = int(card.background_color.replace("#", ""), 16) if card.background_color else 0xFF69B4
         
         rarity_str = RARITY_STR_MAPPING.get(card.rarity, "n ")
         
-        collection_entry = await CollectionModel.filter(user_id=str(user.id), objekt_id=card.id).first()        
-        if collection_entry and collection_entry.copies > 1:
-            copies_message = f"You now have {collection_entry.copies} copies of this objekt!"
+        if copies > 1:
+            copies_message = f"You now have {copies} copies of this objekt!"
         else:
             copies_message = "Congrats on your new objekt!"
 
@@ -351,38 +290,71 @@ class EconomyPlugin(Plugin):
 
         return embed
 
-    def create_sell_callback(self, user_id: str, rarity: int, leave: int):
+    def create_multi_spin_embed(
+        self,
+        user: discord.User,
+        pulls: list[tuple[ObjektRecord, int | None]],
+        copies: dict[int, int],
+        pity_entry: PityModel,
+        como_reward: int,
+        reminders: list[str]
+    ) -> discord.Embed:
+        pulled = Counter(card.id for card, _ in pulls)
+        cards = {card.id: card for card, _ in pulls}
+        best = max(cards.values(), key=lambda card: card.rarity)
+        color = int(best.background_color.replace("#", ""), 16) if best.background_color else 0xFF69B4
+
+        lines = []
+        for card in sorted(cards.values(), key=lambda card: (-card.rarity, card.member or "")):
+            amount = pulled[card.id]
+            new = " **NEW**" if copies.get(card.id, 0) == amount else ""
+            lines.append(
+                f"[{card.member} {card.season[0] * int(card.season[-1])}{card.series}]({card.image_url}) "
+                f"(Rarity {card.rarity}) x{amount}{new}"
+            )
+
+        # rarest first, so whatever has to be cut is the commons; 20 leaves room for the "more" line
+        shown, length = [], 0
+        for index, line in enumerate(lines):
+            if length + len(line) + 1 > EMBED_DESCRIPTION_LIMIT - 20:
+                shown.append(f"…and {len(lines) - index} more")
+                break
+            shown.append(line)
+            length += len(line) + 1
+
+        embed = discord.Embed(title=f"{user} spun {len(pulls)} times!", description="\n".join(shown), color=color)
+        if best.image_url:
+            embed.set_thumbnail(url=best.image_url)
+
+        chase_ends = [pity_taken for _, pity_taken in pulls if pity_taken]
+        if chase_ends:
+            embed.add_field(name="Chase Complete", value=f"Your chase ended after {chase_ends[0]} spins! Don't forget to set a new chase objekt with /set_chase!", inline=False)
+
+        footer_text = (
+            f"General Pity: {pity_entry.pity_count} | Chase Pity: {pity_entry.chase_pity_count}/250\n"
+            f"You earned {como_reward:,} como from these spins!"
+        )
+        if reminders:
+            footer_text += f"\nReminder: {', '.join(reminders)} command(s) are ready!"
+        embed.set_footer(text=footer_text)
+
+        return embed
+
+    def create_sell_callback(self, user_id: int, rarity: int, leave: int):
         async def callback(interaction: discord.Interaction):
-            if str(interaction.user.id) != user_id:
+            if interaction.user.id != user_id:
                 await interaction.response.send_message("You cannot use this button. It is locked to the command caller.", ephemeral=True)
                 return
             
-            collection_entries = await CollectionModel.filter(user_id=user_id, objekt__rarity=rarity).prefetch_related("objekt")
-            if not collection_entries:
-                await interaction.response.send_message(f"You have no extra objekts of rarity {rarity} to sell!", ephemeral=True)
-                return
-            
-            total_sold = 0
-            total_value = 0
             reward_per = RARITY_COMO_REWARDS.get(rarity, 0)
+            objekt_ids = [objekt.id for objekt in self.bot.catalog.with_rarity(rarity)]
+
+            async with self.bot.inventory.transaction():
+                sold = await self.bot.inventory.trim(user_id, objekt_ids, leave)
+                total_sold = sum(sold.values())
+                total_value = (reward_per * 2) * total_sold
 
-            async with in_transaction():
-                for entry in collection_entries:
-                    if entry.copies > leave:
-                        sell_count = entry.copies - leave
-                        sale_value = (reward_per * 2) * sell_count
-                        total_sold += sell_count
-                        total_value += sale_value
-
-                        entry.copies = leave
-                        if entry.copies == 0:
-                            await entry.delete()
-                        else: 
-                            await entry.save()
-
-                user_data = await self.get_user_data(id=int(user_id))
-                user_data.balance += total_value
-                await user_data.save()
+                await self.bot.ledger.credit(user_id, total_value)
             
             if total_sold == 0:
                 await interaction.response.send_message(f"You have no duplicates of rarity {rarity} above the leave limit to sell.", ephemeral=True)
@@ -391,66 +363,40 @@ class EconomyPlugin(Plugin):
             
         return callback
 
-    async def get_rarity_summary(self, user_id: str, leave: int):
-        collection_entries = await CollectionModel.filter(user_id=user_id).prefetch_related("objekt")
-        rarity_summary = {}
-        for entry in collection_entries:
-            rarity = entry.objekt.rarity
-            if rarity not in rarity_summary:
-                rarity_summary[rarity] = {"unique": 0, "dupes": 0}
-            rarity_summary[rarity]["unique"] += 1
-            if entry.copies > leave:
-                rarity_summary[rarity]["dupes"] += entry.copies - leave
-        return rarity_summary
+    async def get_rarity_summary(self, user_id: int, leave: int):
+        return await self.bot.inventory.rarity_summary(user_id, leave)
       
-    async def refresh_shop(self):
-        now = datetime.now(tz=timezone.utc)
-        midnight = datetime.combine(now.date(), datetime.min.time(), tzinfo=timezone.utc) + timedelta(days=1)
-
-        users = await EconomyModel.all()
-
-        for user in users:
-            user_id = user.id
-            await ShopModel.filter(user_id=user_id).delete()
+    async def refresh_shop(self) -> dict[str, float]:
+        return await self.bot.shop.rebuild()
 
-            items = []
-            for _ in range(6):
-                rarity = random.choice(RARITY_TIERS)
-                objekt = await self.get_random_objekt_by_rarity(rarity)
-                if objekt:
-                    price = SHOP_BUY_VALUES.get(objekt.rarity, 0)
-                    items.append(ShopModel(user_id=user_id, objekt=objekt, price=price))
-            if items:
-                await ShopModel.bulk_create(items)
+    def create_purchase_callback(self, shop_item, user, shop_id: int):
+        purchases = 0
 
-    def create_purchase_callback(self, shop_item, user):
         async def callback(interaction:discord.Interaction):
+            nonlocal purchases
             if interaction.user != user:
                 await interaction.response.send_message("Open your own shop to purchase!", ephemeral=True)
                 return
 
-            user_data = await self.get_user_data(id=user.id)
+            await interaction.response.defer()
 
-            if user_data.balance < shop_item.price:
-                await interaction.response.send_message("You don't have enough como!", ephemeral=True)
+            # clicks before a purchase completes share its key and are dropped as duplicates;
+            # each completed purchase moves the button on to a fresh key so buying again still works
+            key = f"{shop_id}:{shop_item.slot}:{purchases}"
+            result = await self.bot.shop.purchase(user.id, shop_item, key, ledger=self.bot.ledger, inventory=self.bot.inventory)
+            if result.status == "insufficient":
+                await interaction.followup.send("You don't have enough como!", ephemeral=True)
                 return
-            
-            await interaction.response.defer()
-            
-            user_data.balance -= shop_item.price
-            await user_data.save()
-            await self.add_objekt_to_user(user.id, shop_item.objekt)
-            
+            if result.status == "duplicate":
+                return
+            purchases += 1
+
             await interaction.followup.send(
                 f"{user.mention} successfully purchased **[{shop_item.objekt.member} {shop_item.objekt.season[0] * int(shop_item.objekt.season[-1])}{shop_item.objekt.series}]({shop_item.objekt.image_url})** for **{shop_item.price}** como!", ephemeral=True
             )
         
         return callback
     
-    async def get_objekt_count(self, user_id, objekt):
-        entry = await CollectionModel.get_or_none(user_id=user_id, objekt=objekt)
-        return entry.copies if entry else 1
-
     @app_commands.command(name="balance", description="Show your balance or another user's balance.")
     async def balance_command(self, interaction: discord.Interaction, user: discord.User | None):
         await interaction.response.defer()
@@ -471,9 +417,9 @@ class EconomyPlugin(Plugin):
         user_id = interaction.user.id
         now = datetime.now(tz=timezone.utc)
 
-        cooldown = await self.get_cooldown(user_id, "daily")
-        if cooldown and cooldown.expires_at > now:
-            remaining_time = self.format_time_difference(cooldown.expires_at - now)
+        expires_at = await self.get_cooldown(user_id, "daily")
+        if expires_at and expires_at > now:
+            remaining_time = self.format_time_difference(expires_at - now)
             await interaction.followup.send(
                 f"You are on cooldown! Try again in {remaining_time}.",
                 ephemeral=True
@@ -507,9 +453,9 @@ class EconomyPlugin(Plugin):
         user_id = interaction.user.id
         now = datetime.now(tz=timezone.utc)
         
-        cooldown = await self.get_cooldown(user_id, "weekly")
-        if cooldown and cooldown.expires_at > now:
-            remaining_time = self.format_time_difference(cooldown.expires_at - now)
+        expires_at = await self.get_cooldown(user_id, "weekly")
+        if expires_at and expires_at > now:
+            remaining_time = self.format_time_difference(expires_at - now)
             await interaction.followup.send(
                 f"You are on cooldown! Try again in {remaining_time}.",
                 ephemeral=True
@@ -551,7 +497,7 @@ class EconomyPlugin(Plugin):
     async def set_chase_command(self, interaction: discord.Interaction, season: str, member: str, series: str):
         await interaction.response.defer()
 
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
         objekt_slug = f"{season}-{member}-{series}".lower()
 
         # validate slug
@@ -561,6 +507,7 @@ class EconomyPlugin(Plugin):
             return
         
         # get or create the user's pity entry
+        await self.bot.ledger.ensure(user_id)
         pity_entry, _ = await PityModel.get_or_create(user_id=user_id)
 
         # check if chase already set
@@ -584,15 +531,22 @@ class EconomyPlugin(Plugin):
         await interaction.followup.send(embed=embed)
     
     @app_commands.command(name="spin", description="Collect a random objekt!")
-    @app_commands.describe(banner="Select a banner to spin from (leave blank to spin all seasons).")
-    @app_commands.choices(banner=BANNER_CHOICES)
-    @app_commands.checks.cooldown(1,10, key=lambda i: (i.user.id,))
-    async def spin_command(self, interaction: discord.Interaction, banner: app_commands.Choice[str] | None = None):
+    @app_commands.describe(
+        banner="Select a banner to spin from (leave blank to spin all seasons).",
+        count="How many spins to do at once (the cooldown scales with the count)."
+    )
+    @app_commands.choices(banner=BANNER_CHOICES, count=SPIN_COUNT_CHOICES)
+    @rate_limit(1, 10, cost=spin_cost)
+    async def spin_command(self, interaction: discord.Interaction, banner: app_commands.Choice[str] | None = None, count: app_commands.Choice[int] | None = None):
         await interaction.response.defer()
 
         try:
             user_id = interaction.user.id
             banner_value = banner.value if isinstance(banner, app_commands.Choice) else banner
+            count_value = count.value if isinstance(count, app_commands.Choice) else (count or 1)
+
+            # pity and cooldown rows reference economy
+            await self.bot.ledger.ensure(user_id)
 
             reminders = await self.get_ready_commands(user_id, datetime.now(tz=timezone.utc), ["daily", "rob", "weekly"])
 
@@ -600,16 +554,17 @@ class EconomyPlugin(Plugin):
             pity_entry, _ = await PityModel.get_or_create(user_id=user_id)
 
             # roll
-            card, pity_taken = await self.give_random_objekt(user_id, banner=banner_value, pity_entry=pity_entry)
+            pulls, copies, como_reward = await self.give_random_objekts(user_id, count_value, banner=banner_value, pity_entry=pity_entry)
 
-            if not card:
+            if not pulls:
                 await interaction.followup.send("No objekts found in the database.")
                 return
-            
-            como_reward = self.calculate_como_reward(card.rarity)
-            await self.update_user_balance(user_id, como_reward)
 
-            embed = await self.create_spin_embed(interaction.user, card, pity_entry, pity_taken, como_reward, reminders)
+            if len(pulls) == 1:
+                card, pity_taken = pulls[0]
+                embed = await self.create_spin_embed(interaction.user, card, pity_entry, pity_taken, como_reward, reminders, copies.get(card.id, 1))
+            else:
+                embed = self.create_multi_spin_embed(interaction.user, pulls, copies, pity_entry, como_reward, reminders)
             await interaction.followup.send(embed=embed)
             
         except Exception as e:
@@ -637,18 +592,18 @@ class EconomyPlugin(Plugin):
     async def rob_command(self, interaction: discord.Interaction, target: discord.User):
         await interaction.response.defer()
 
-        user_id = str(interaction.user.id)
-        target_id = str(target.id)
+        user_id = interaction.user.id
+        target_id = target.id
 
         if target_id == user_id:
             await interaction.followup.send("You can't rob yourself! masochist.")
             return
         
         now = datetime.now(tz=timezone.utc)
-        cooldown = await self.get_cooldown(user_id, "rob")
+        expires_at = await self.get_cooldown(user_id, "rob")
 
-        if cooldown and cooldown.expires_at > now:
-            remaining_time = self.format_time_difference(cooldown.expires_at - now)
+        if expires_at and expires_at > now:
+            remaining_time = self.format_time_difference(expires_at - now)
             await interaction.followup.send(
                 f"You are on cooldown! Try again in {remaining_time}.",
                 ephemeral=True
@@ -658,45 +613,28 @@ class EconomyPlugin(Plugin):
         reminders = await self.get_ready_commands(user_id, now, ["daily", "weekly"])
         
         if random.random() < 0.15:
-            user_data = await self.get_user_data(id=interaction.user.id)
             loss_amount = random.randint(100, 200)
-            user_data.balance = max(0, user_data.balance - loss_amount)
-            await user_data.save()
+            await self.bot.ledger.ensure(interaction.user.id)
+            _, balance = await self.bot.ledger.withdraw(interaction.user.id, loss_amount)
             await interaction.followup.send(
-                f"{interaction.user.mention} attempted to rob {target.mention} but failed, losing **{loss_amount}** como in the process.\n{interaction.user} now has {user_data.balance} como left."
+                f"{interaction.user.mention} attempted to rob {target.mention} but failed, losing **{loss_amount}** como in the process.\n{interaction.user} now has {balance} como left."
             )
             return
 
-        target_inventory = await CollectionModel.filter(user_id=target_id).prefetch_related("objekt")
+        target_inventory = await self.bot.inventory.entries(target_id)
         if not target_inventory:
             await interaction.followup.send(f"{target} has nothing to rob!")
             return
         
         stolen_objekt = random.choice(target_inventory)
-        target_data = await self.get_user_data(id=target.id)
-        user_data = await self.get_user_data(id=interaction.user.id)
-        stolen_como = random.randint(50, 200)
-        if target_data.balance < stolen_como:
-            stolen_como = target_data.balance
         
-        async with in_transaction():
-            if stolen_objekt.copies > 1:
-                stolen_objekt.copies -= 1
-                await stolen_objekt.save()
-            else:
-                await stolen_objekt.delete()
-
-            user_entry = await CollectionModel.filter(user_id=user_id, objekt_id=stolen_objekt.objekt.id).first()
-            if user_entry:
-                user_entry.copies += 1
-                await user_entry.save()
-            else:
-                await CollectionModel.create(user_id=user_id, objekt=stolen_objekt.objekt, copies=1)
+        async with self.bot.inventory.transaction():
+            if await self.bot.inventory.transfer(target_id, user_id, stolen_objekt.objekt.id) is None:
+                await interaction.followup.send(f"{target} has nothing to rob!")
+                return
 
-            target_data.balance -= stolen_como
-            user_data.balance +=  stolen_como
-            await target_data.save()
-            await user_data.save()
+            stolen_como, _ = await self.bot.ledger.withdraw(target.id, random.randint(50, 200))
+            await self.bot.ledger.credit(interaction.user.id, stolen_como)
         
         expires_at = now + timedelta(hours=6)
         await self.set_cooldown(user_id, "rob", expires_at)
@@ -722,31 +660,21 @@ class EconomyPlugin(Plugin):
     async def send_objekt_command(self, interaction:discord.Interaction, recipient: discord.User, season: str, member: str, series: int):
         await interaction.response.defer()
 
-        sender_id = str(interaction.user.id)
-        recipient_id = str(recipient.id)
+        sender_id = interaction.user.id
+        recipient_id = recipient.id
 
         if sender_id == recipient_id:
             await interaction.followup.send("You can't send an objekt to yourself!", ephemeral=True)
             return
         
-        objekt = await ObjektModel.filter(season__iexact=season, member__iexact=member, series=str(series)).first()
+        objekt = self.bot.catalog.find(season, member, str(series))
         if not objekt:
             await interaction.followup.send("Objekt not found!", ephemeral=True)
             return
 
-        async with in_transaction():
-            sender_entry = await CollectionModel.filter(user_id=sender_id, objekt_id=objekt.id).first()
-            if not sender_entry or sender_entry.copies < 1:
-                await interaction.followup.send("You don't have that objekt!", ephemeral=True)
-                return
-            
-            sender_entry.copies -= 1
-            if sender_entry.copies == 0:
-                await sender_entry.delete()
-            else:
-                await sender_entry.save()
-
-            await self.add_objekt_to_user(recipient_id, objekt)
+        if await self.bot.inventory.transfer(sender_id, recipient_id, objekt.id) is None:
+            await interaction.followup.send("You don't have that objekt!", ephemeral=True)
+            return
             
         color = int(objekt.background_color.replace("#", ""), 16) if objekt.background_color else 0xff69b4
         embed = discord.Embed(
@@ -771,7 +699,7 @@ class EconomyPlugin(Plugin):
     )
     async def sell_objekt_command(self, interaction: discord.Interaction, leave: int = 1):
         await interaction.response.defer()
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
 
         rarity_summary = await self.get_rarity_summary(user_id, leave)
         
@@ -804,7 +732,7 @@ class EconomyPlugin(Plugin):
         await interaction.response.defer()
         
         user_id = interaction.user.id
-        shop_items = await ShopModel.filter(user_id=user_id).prefetch_related("objekt")
+        shop_items = await self.bot.shop.view(user_id)
 
         if not shop_items:
             await interaction.followup.send("Your shop is currently empty. Please wait for the next refresh!")
@@ -822,10 +750,9 @@ class EconomyPlugin(Plugin):
         )
 
         view = View()
-        for idx, item in enumerate(shop_items, start=1):
+        for idx, (item, copies) in enumerate(shop_items, start=1):
             objekt = item.objekt
-            collection_entry = await CollectionModel.filter(user_id=str(user_id), objekt_id=objekt.id).first()
-            owned = f"Owned: **{collection_entry.copies}**" if collection_entry else "Not Owned"
+            owned = f"Owned: **{copies}**" if copies else "Not Owned"
             embed.add_field(
                 name=f"{idx}. {objekt.member} {objekt.season[0] * int(objekt.season[-1])}{objekt.series}",
                 value=(
@@ -837,7 +764,7 @@ class EconomyPlugin(Plugin):
                 inline=True
             )
             button = Button(label=f"Buy #{idx}", style=discord.ButtonStyle.blurple)
-            button.callback = self.create_purchase_callback(item, interaction.user)
+            button.callback = self.create_purchase_callback(item, interaction.user, interaction.id)
             button.row = (idx - 1) // 3
             view.add_item(button)
 
@@ -847,17 +774,16 @@ class EconomyPlugin(Plugin):
     @app_commands.describe(
         bet="The amount of como to bet on the slot machine, or 'all' to go all in."
     )
-    @app_commands.checks.cooldown(1, 10, key=lambda i: (i.user.id,))
+    @rate_limit(1, 10)
     async def slots_command(self, interaction: discord.Interaction, bet: str):
         await interaction.response.defer()
 
         user_id = interaction.user.id
-        user_data = await self.get_user_data(id=user_id)
 
         if isinstance(bet, str) and bet.lower() in ("all", "max", "all in"):
-            bet_amount = user_data.balance
+            bet_amount = (await self.get_user_data(id=user_id)).balance
         elif isinstance(bet, str) and bet.lower() in ("half"):
-            bet_amount = (user_data.balance // 2)
+            bet_amount = ((await self.get_user_data(id=user_id)).balance // 2)
         else:
             try:
                 bet_amount = int(bet)
@@ -869,12 +795,10 @@ class EconomyPlugin(Plugin):
         if bet_amount <= 0:
             await interaction.followup.send("Your bet must be greater than 0!", ephemeral=True)
             return
-        if user_data.balance < bet_amount:
+        balance = await self.bot.ledger.debit(user_id, bet_amount)
+        if balance is None:
             await interaction.followup.send("You don't have enough como to place this bet! Broke ahh")
             return
-        
-        user_data.balance -= bet_amount
-        await user_data.save()
 
         # slot machine definition
         symbols = ["🍒", "🍋", "🍊", "🍇", "⭐", "💎"]
@@ -901,8 +825,8 @@ class EconomyPlugin(Plugin):
         elif result.count(result[0]) == 2 or result.count(result[1]) == 2:
             payout = bet_amount * 2
         
-        user_data.balance += payout
-        await user_data.save()
+        if payout:
+            balance = await self.bot.ledger.credit(user_id, payout)
 
         payout_ratio = payout // bet_amount if bet_amount > 0 else 0
 
@@ -916,21 +840,21 @@ class EconomyPlugin(Plugin):
         )
 
         if payout_ratio == 3:
-            result_message = f"🎉Win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {user_data.balance:,} como."
+            result_message = f"🎉Win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {balance:,} como."
         elif payout_ratio == 4:
-            result_message = f"🎉 Small win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {user_data.balance:,} como."
+            result_message = f"🎉 Small win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {balance:,} como."
         elif payout_ratio == 5:
-            result_message = f"🎉 Big win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {user_data.balance:,} como."
+            result_message = f"🎉 Big win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {balance:,} como."
         elif payout_ratio == 6:
-            result_message = f"🎉 Huge win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {user_data.balance:,} como."
+            result_message = f"🎉 Huge win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {balance:,} como."
         elif payout_ratio == 7:
-            result_message = f"🎉 Tremendous win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {user_data.balance:,} como."
+            result_message = f"🎉 Tremendous win! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {balance:,} como."
         elif payout_ratio == 10:
-            result_message = f"🎉 JACKPOT!!! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**!!! 🎉\n {interaction.user} now has {user_data.balance:,} como."
+            result_message = f"🎉 JACKPOT!!! {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**!!! 🎉\n {interaction.user} now has {balance:,} como."
         elif payout_ratio == 2:
-            result_message = f"🎉 {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {user_data.balance:,} como."
+            result_message = f"🎉 {interaction.user} bet {bet_amount:,} como and wins **{payout:,} como**! 🎉\n {interaction.user} now has {balance:,} como."
         else: 
-            result_message = f"😢 {interaction.user} bet {bet_amount:,} como and lost, leaving them with {user_data.balance:,} como... Better luck next time..."
+            result_message = f"😢 {interaction.user} bet {bet_amount:,} como and lost, leaving them with {balance:,} como... Better luck next time..."
         
         embed.add_field(name="Result", value=result_message, inline=False)
 
@@ -952,8 +876,17 @@ class EconomyPlugin(Plugin):
     @app_commands.command(name="refresh_shop", description="Force refresh shop if issues. Admin only.")
     @app_commands.checks.has_permissions(administrator=True)
     async def manual_refresh_shop_command(self, interaction:discord.Interaction):
-        await self.refresh_shop()
-        await interaction.response.send_message("Manual shop refresh complete.", ephemeral=True)
+        if self.bot.shop.lazy:
+            await self.bot.shop.reroll()
+            await interaction.response.send_message("Shops rerolled, everyone gets a new shop on their next view.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        stats = await self.refresh_shop()
+        await interaction.followup.send(
+            f"Manual shop refresh complete: {stats['rows']:,} items for {stats['users']:,} users in {stats['total_seconds']}s.",
+            ephemeral=True
+        )
 
 async def setup(bot: Bot): 
     await bot.add_cog(EconomyPlugin(bot))
\ No newline at end of file
@@ -6,7 +6,7 @@ from discord.ext import commands
 from discord import app_commands
 import json
 import random
-from core import Bot, TriviaSessionModel, TriviaStatsModel, ObjektModel
+from core import Bot, TriviaSessionModel, TriviaStatsModel, rate_limit
 from .. import Plugin
 
 TRIVIA_BASE_COMO = 100
@@ -61,7 +61,7 @@ class TriviaPlugin(Plugin):
             self.questions = json.load(f)
 
     @app_commands.command(name="trivia", description="Answer a trivia question for a como and objekt reward!")
-    @app_commands.checks.cooldown(1, 60, key=lambda i: (i.user.id,))
+    @rate_limit(1, 60)
     async def trivia_command(self, interaction: discord.Interaction):
         await interaction.response.defer()
         user_id = interaction.user.id
@@ -131,11 +131,9 @@ class TriviaPlugin(Plugin):
                 else:
                     objekt_rarity = min(stats.streak // TRIVIA_STREAKS_PER_RARITY, TRIVIA_MAX_RARITY)
 
-                objekts = await ObjektModel.filter(rarity=objekt_rarity).all()
-                if objekts:
-                    objekt = random.choice(objekts)
-                    await economy_cog.add_objekt_to_user(user_id, objekt)
-                    count = await economy_cog.get_objekt_count(user_id, objekt)
+                objekt = self.bot.catalog.random_by_rarity(objekt_rarity)
+                if objekt:
+                    count = await economy_cog.add_objekt_to_user(user_id, objekt)
                     objekt_msg = f"\n🎁 You also received a random rarity {objekt_rarity} objekt: **[{objekt.member} {objekt.season[0] * int(objekt.season[-1])}{objekt.series}]({objekt.image_url})**!"
 
                     color = int(objekt.background_color.replace("#", ""), 16) if getattr(objekt, "background_color", None) else 0x0f0
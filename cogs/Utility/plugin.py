@@ -1,19 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import random
+from collections import Counter
 from typing import Optional
 
 import discord
 import os
-from PIL import Image
 import requests
-import aiohttp
 from io import BytesIO
 from .. import Plugin
 from datetime import datetime, timezone
-from tortoise.transactions import in_transaction
-from core import Bot, Embed, CooldownModel, PityModel, ObjektModel, CollectionModel, EconomyModel
-from core.constants import SEASON_CHOICES, RARITY_MAPPING, MEMBER_PRIORITY, CLASS_CHOICES, RARITY_CHOICES, SORT_CHOICES, RARITY_COMO_REWARDS, SLURS
+from core import Bot, Embed, PityModel, CollectionModel, InventoryPages, CollageSpec
+from core.constants import PERSIST_SERIES_COLLAGES, SEASON_CHOICES, RARITY_MAPPING, MEMBER_PRIORITY, CLASS_CHOICES, RARITY_CHOICES, SORT_CHOICES, RARITY_COMO_REWARDS, SLURS
 from discord import Interaction, app_commands
 from discord.ext.commands import is_owner
 from discord.ui import View, Button
@@ -21,7 +20,6 @@ from discord.ui import View, Button
 class Utility(Plugin):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
-        self.cache = {}
     
     async def check_admin_permissions(self, interaction: discord.Interaction) -> bool:
         if await interaction.client.is_owner(interaction.user) or interaction.user.guild_permissions.administrator:
@@ -36,11 +34,8 @@ class Utility(Plugin):
                 embed.add_field(name=name, value=value, inline=False)
         return embed
 
-    async def update_user_balance(self, user_id: int, amount: int) -> EconomyModel:
-        user_data, _ = await EconomyModel.get_or_create(id=user_id)
-        user_data.balance += amount
-        await user_data.save()
-        return user_data
+    async def update_user_balance(self, user_id: int, amount: int) -> int:
+        return await self.bot.ledger.credit(user_id, amount)
     
     async def format_time_remaining(self, expires_at: datetime) -> str:
         time_remaining = expires_at - datetime.now(timezone.utc)
@@ -70,16 +65,24 @@ class Utility(Plugin):
         else:
             return (6, 4)
 
-    async def generate_collage(self, season: str, series: str, page: int, page_objekts: list, grid_size: tuple[int, int]) -> tuple[str, str]:
-        base_dir = "collage"
-        series_dir = os.path.join(base_dir, "series")
-        os.makedirs(series_dir, exist_ok=True)
+    def all_tiles_loaded(self, urls, thumbnails) -> bool:
+        """True unless an image that exists failed to load."""
+        return all(img is not None for url, img in zip(urls, thumbnails) if url)
 
-        filename = os.path.join(series_dir, f"collage_{season}_{series}_page_{page}.png")
-        cache_key = f"{season}_{series}_page_{page}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+    def read_collage(self, path: str) -> bytes | None:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
 
+    def write_collage(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+
+    async def generate_collage(self, season: str, series: str, page: int, page_objekts: list, grid_size: tuple[int, int]) -> tuple[bytes, str]:
         thumb_size = (200, 300)
         gap = 10
         edge_padding = 20
@@ -87,32 +90,39 @@ class Utility(Plugin):
         collage_height = (thumb_size[1] + gap) * grid_size[1] - gap + 2 * edge_padding
 
         background_color = self.get_background_color(page_objekts)
-        collage = Image.new('RGBA', (collage_width, collage_height), background_color)
-
-        async with aiohttp.ClientSession() as session:
-            for index, objekt in enumerate(page_objekts):
-                try:
-                    async with session.get(objekt.image_url, timeout=10) as response:
-                        response.raise_for_status()
-                        img_data = await response.read()
-                        img = Image.open(BytesIO(img_data))
-                        img.thumbnail(thumb_size)
 
-                        x = edge_padding + (index % grid_size[0]) * (thumb_size[0] + gap)
-                        y = edge_padding + (index // grid_size[0]) * (thumb_size[1] + gap)
-                        collage.paste(img, (x, y))
-                except Exception as e:
-                    print(f"Error loading image from {objekt.image_url}: {e}")
-
-        collage.save(filename, format='PNG')
+        cache = self.bot.render_cache
+        urls = tuple(objekt.image_url for objekt in page_objekts)
+        key = cache.key("series", grid_size, background_color, urls)
+        path = os.path.join("collage", "series", f"{key}.png")
+        data = cache.get(key)
+        if data is None and PERSIST_SERIES_COLLAGES:
+            data = await asyncio.to_thread(self.read_collage, path)
+            if data is not None:
+                cache.set(key, data)
+        if data is None:
+            thumbnails = await self.bot.thumbnails.get_many(urls, thumb_size)
+            tiles = [
+                (img, (
+                    edge_padding + (index % grid_size[0]) * (thumb_size[0] + gap),
+                    edge_padding + (index // grid_size[0]) * (thumb_size[1] + gap)
+                ))
+                for index, img in enumerate(thumbnails)
+                if img is not None
+            ]
+            data = await self.bot.renderer.render(CollageSpec((collage_width, collage_height), background_color, tiles))
+            # a page with blank slots from a failed fetch is served but never kept
+            if self.all_tiles_loaded(urls, thumbnails):
+                if PERSIST_SERIES_COLLAGES:
+                    await asyncio.to_thread(self.write_collage, path, data)
+                cache.set(key, data)
 
         names = [f"**{objekt.member}**" for objekt in page_objekts]
         description = "\n".join(
             [", ".join(names[i:i + grid_size[0]]) for i in range(0, len(names), grid_size[0])]
         )
 
-        self.cache[cache_key] = (filename, description)
-        return filename, description
+        return data, description
 
     def get_background_color(self, page_objekts: list) -> tuple[int, int, int, int]:
         """Calculate the background color based on the first objekt's color."""
@@ -131,32 +141,30 @@ class Utility(Plugin):
     def safe_updated_at(self, dt):
         return dt or datetime.max.replace(tzinfo=timezone.utc)
 
-    async def generate_leaderboard_data(self, users, total_objekts_ids, mode):
-        leaderboard_data = []
-        for user in users:
-            user_id = str(user.id)
-            discord_user = await self.bot.fetch_user(user_id)
-            user_name = discord_user.name if discord_user else "Unknown User"
+    async def generate_leaderboard_data(self, total_count, mode, member=None, season=None, page=1):
+        rows = await self.bot.leaderboard.top(
+            member=member,
+            season=season.value if season else None,
+            by=mode.value if mode else "percent",
+            limit=10,
+            offset=(page - 1) * 10
+        )
 
-            collected_objekts = await CollectionModel.filter(user_id=user_id, objekt__id__in=total_objekts_ids).prefetch_related("objekt")
+        # names are only resolved for the rows that are displayed
+        names = await self.bot.names.resolve(row["user_id"] for row in rows)
 
-            try:
-                economy_entry = await EconomyModel.get(id=user_id)
-                updated_at = economy_entry.updated_at
-            except Exception:
-                updated_at = None
+        leaderboard_data = []
+        for rank, row in enumerate(rows, start=(page - 1) * 10 + 1):
+            user_name = names[row["user_id"]]
 
             if mode and mode.value == "copies":
-                total_copies = sum(entry.copies for entry in collected_objekts)
-                leaderboard_data.append((user_id, user_name, total_copies, updated_at))
+                leaderboard_data.append((rank, user_name, row["copies"]))
             else:
-                collected_ids = {entry.objekt.id for entry in collected_objekts}
-                collected_count = len(collected_ids)
-                total_count = len(total_objekts_ids)
+                collected_count = row["unique_owned"]
                 percent_complete = (collected_count / total_count) * 100 if total_count > 0 else 0
-                leaderboard_data.append((user_id, user_name, percent_complete, updated_at, collected_count, total_count))
+                leaderboard_data.append((rank, user_name, percent_complete, collected_count, total_count))
 
-        return sorted(leaderboard_data, key=lambda x: (-x[2], self.safe_updated_at(x[3])))
+        return leaderboard_data
 
     def get_leaderboard_title(self, mode, member, season):
         embed_title = "GNDSG Slur Gacha Leaderboard"
@@ -171,12 +179,12 @@ class Utility(Plugin):
         return embed_title
 
     def add_leaderboard_fields(self, embed, leaderboard_data, mode):
-        for rank, entry in enumerate(leaderboard_data[:10], start=1):
+        for entry in leaderboard_data:
             if mode and mode.value == "copies":
-                user_id, user_name, total_copies, _ = entry
+                rank, user_name, total_copies = entry
                 embed.add_field(name=f"#{rank} {user_name}", value=f"**{total_copies:,}** copies held", inline=False)
             else:
-                user_id, user_name, percent_complete, _, collected_count, total_count = entry
+                rank, user_name, percent_complete, collected_count, total_count = entry
                 embed.add_field(name=f"#{rank} {user_name}", value=f"**({collected_count:,}/{total_count:,})** | **{percent_complete:.2f}%** complete", inline=False)
 
     def select_objekts_to_give(self, unowned_objekts, all_objekts, amount):
@@ -193,31 +201,22 @@ class Utility(Plugin):
         return RARITY_COMO_REWARDS.get(rarity_value, 0) * amount
 
     async def perform_objekt_transaction(self, user_id, selected_objekts, total_como_reward):
-        async with in_transaction():
-            for objekt in selected_objekts:
-                collection_entry = await CollectionModel.filter(user_id=user_id, objekt_id=objekt.id).first()
-                if collection_entry:
-                    collection_entry.copies += 1
-                    await collection_entry.save()
-                else:
-                    await CollectionModel.create(user_id=user_id, objekt_id=objekt.id, copies=1)
-
-            user_data, _ = await EconomyModel.get_or_create(id=user_id)
-            user_data.balance += total_como_reward
-            await user_data.save()
-
-    async def fetch_filtered_inventory(self, user_id: str, member: str | None, season: app_commands.Choice[str] | None,
-                                   rarity: app_commands.Choice[int] | None, class_: app_commands.Choice[str] | None):
-        query = CollectionModel.filter(user_id=user_id).prefetch_related("objekt")
-        if member:
-            query = query.filter(objekt__member__iexact=member)
-        if season:
-            query = query.filter(objekt__season__iexact=season.value)
-        if rarity:
-            query = query.filter(objekt__rarity__iexact=rarity.value)
-        if class_:
-            query = query.filter(objekt__class___iexact=class_.value)
-        return await query
+        async with self.bot.inventory.transaction():
+            await self.bot.inventory.add_many(user_id, Counter(objekt.id for objekt in selected_objekts))
+
+            await self.bot.ledger.credit(user_id, total_como_reward)
+
+    async def fetch_filtered_inventory(self, user_id: int, member: str | None, season: app_commands.Choice[str] | None,
+                                   rarity: app_commands.Choice[int] | None, class_: app_commands.Choice[str] | None,
+                                   min_copies: int = 1):
+        return await self.bot.inventory.entries(
+            user_id,
+            member=member,
+            season=season.value if season else None,
+            rarity=rarity.value if rarity else None,
+            class_=class_.value if class_ else None,
+            min_copies=min_copies
+        )
 
     async def create_confirmation_embed(self, duplicates_to_send, recipient_name: str):
         embed = await self.create_embed(
@@ -235,18 +234,11 @@ class Utility(Plugin):
             embed.add_field(name="And ...", value=f"{remaining_count} more objekts will be sent.", inline=False)
         return embed
 
-    async def perform_duplicates_transaction(self, sender_id: str, recipient_id: str, duplicates_to_send):
-        async with in_transaction():
-            for entry in duplicates_to_send:
-                entry.copies -= 1
-                await entry.save()
-
-                recipient_entry = await CollectionModel.filter(user_id=recipient_id, objekt_id=entry.objekt.id).first()
-                if recipient_entry:
-                    recipient_entry.copies += 1
-                    await recipient_entry.save()
-                else:
-                    await CollectionModel.create(user_id=recipient_id, objekt_id=entry.objekt.id, copies=1)
+    async def perform_duplicates_transaction(self, sender_id: int, recipient_id: int, duplicates_to_send):
+        counts = {entry.objekt.id: 1 for entry in duplicates_to_send}
+        async with self.bot.inventory.transaction():
+            sent = await self.bot.inventory.remove_many(sender_id, counts)
+            await self.bot.inventory.add_many(recipient_id, {objekt_id: counts[objekt_id] for objekt_id in sent})
 
     async def create_success_embed(self, sender_name: str, recipient_name: str, duplicates_to_send):
         embed = discord.Embed(
@@ -290,44 +282,35 @@ class Utility(Plugin):
             await interaction.response.defer()
             self.stop()
 
-    async def create_collage(self, image_urls: list, filename='collage.png') -> tuple[str, str]:
-        base_dir = "collage"
-        os.makedirs(base_dir, exist_ok=True)
-        filename = os.path.join(base_dir, filename)
-
+    async def create_collage(self, image_urls: list) -> tuple[bytes, str]:
         thumb_size = (130, 200)
         grid_size = (3, 3)
         collage_width = (thumb_size[0] * grid_size[0])
         collage_height = (thumb_size[1] * grid_size[1])
 
         background_color = (0, 0, 0, 0)
-        collage = Image.new('RGBA', (collage_width, collage_height), background_color)
 
-        async with aiohttp.ClientSession() as session:
-            for index, objekt in enumerate(image_urls):
-                try:
-                    async with session.get(objekt.image_url, timeout=10) as response:
-                        response.raise_for_status()
-                        img_data = await response.read()
-                        img = Image.open(BytesIO(img_data))
-                        if img.mode != "RGBA":
-                            img = img.convert("RGBA")
-                        img.thumbnail(thumb_size)
-
-                        x = (index % grid_size[0]) * thumb_size[0]
-                        y = (index // grid_size[0]) * thumb_size[1]
-                        collage.paste(img, (x, y), mask=img.split()[3])
-                except Exception as e:
-                    print(f"Error loading image from {getattr(objekt, 'image_url', None)}: {e}")
-        
-        collage.save(filename, format='PNG')
-        
+        cache = self.bot.render_cache
+        urls = tuple(getattr(objekt, 'image_url', None) for objekt in image_urls)
+        key = cache.key("inventory", grid_size, urls)
+        data = cache.get(key)
+        if data is None:
+            thumbnails = await self.bot.thumbnails.get_many(urls, thumb_size)
+            tiles = [
+                (img, ((index % grid_size[0]) * thumb_size[0], (index // grid_size[0]) * thumb_size[1]))
+                for index, img in enumerate(thumbnails)
+                if img is not None
+            ]
+            data = await self.bot.renderer.render(CollageSpec((collage_width, collage_height), background_color, tiles, masked=True))
+            if self.all_tiles_loaded(urls, thumbnails):
+                cache.set(key, data)
+
         names = [f"**{getattr(objekt, 'member', '')}**" for objekt in image_urls]
         description = "\n".join(
             [", ".join(names[i:i + grid_size[0]]) for i in range(0, len(names), grid_size[0])]
         )
 
-        return filename, description
+        return data, description
 
     @app_commands.command(name='ping', description="Shows the bot's latency.")
     async def ping_command(self, interaction: Interaction):
@@ -338,8 +321,8 @@ class Utility(Plugin):
     async def cooldowns_command(self, interaction: Interaction):
         await interaction.response.defer()
 
-        user_id = str(interaction.user.id)
-        cooldowns = await CooldownModel.filter(user_id=user_id).all()
+        user_id = interaction.user.id
+        cooldowns = await self.bot.cooldowns.get_all(user_id)
 
         if not cooldowns:
             await interaction.followup.send("You currently have no active cooldowns.", ephemeral=True)
@@ -350,10 +333,10 @@ class Utility(Plugin):
             description="Here are your current cooldowns:",
             color=0x00FF00
         )
-        for cooldown in cooldowns:
+        for command, expires_at in cooldowns.items():
             embed.add_field(
-                name=cooldown.command,
-                value=f"Time remaining: {await self.format_time_remaining(cooldown.expires_at)}",
+                name=command,
+                value=f"Time remaining: {await self.format_time_remaining(expires_at)}",
                 inline=False
             )
         
@@ -363,7 +346,7 @@ class Utility(Plugin):
     async def chase_command(self, interaction: Interaction):
         await interaction.response.defer()
 
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
 
         chase_objekt_data = await PityModel.filter(user_id=user_id).first()
 
@@ -371,7 +354,7 @@ class Utility(Plugin):
             await interaction.followup.send("You currently have no chase objekt set.", ephemeral=True)
             return
         
-        chase_objekt = await ObjektModel.filter(slug=chase_objekt_data.chase_objekt_slug).first()
+        chase_objekt = self.bot.catalog.get_by_slug(chase_objekt_data.chase_objekt_slug)
         color=int(chase_objekt.background_color.replace("#", ""), 16) if chase_objekt.background_color else 0x00ff00
 
         embed = Embed(
@@ -397,23 +380,17 @@ class Utility(Plugin):
         if not await self.check_admin_permissions(interaction):
             return
         
-        user_id = str(user.id)
+        user_id = user.id
         objekt_slug = f"{season}-{member}-{series}".lower()
 
         # Fetch the objekt
-        objekt = await ObjektModel.filter(slug=objekt_slug).first()
+        objekt = self.bot.catalog.get_by_slug(objekt_slug)
         if not objekt:
             await interaction.followup.send("The specified objekt does not exist!", ephemeral=True)
             return
 
         # Add the objekt to the user's inventory
-        async with in_transaction():
-            collection_entry = await CollectionModel.filter(user_id=user_id, objekt_id=objekt.id).first()
-            if collection_entry:
-                collection_entry.copies += 1
-                await collection_entry.save()
-            else:
-                await CollectionModel.create(user_id=user_id, objekt_id=objekt.id, copies=1)
+        await self.bot.inventory.add(user_id, objekt.id)
 
         # Prepare the embed
         color = int(objekt.background_color.replace("#", ""), 16) if objekt.background_color else 0xFF69B4
@@ -445,7 +422,7 @@ class Utility(Plugin):
         objekt_slug = f"{season}-{member}-{series}".lower()
 
         # Fetch the objekt
-        objekt = await ObjektModel.filter(slug=objekt_slug).first()
+        objekt = self.bot.catalog.get_by_slug(objekt_slug)
         if not objekt:
             await interaction.followup.send("The specified objekt does not exist!", ephemeral=True)
             return
@@ -480,7 +457,7 @@ class Utility(Plugin):
     async def view_gallery_command(self, interaction: discord.Interaction, season: str, series: str):
         await interaction.response.defer()
 
-        objekts = await ObjektModel.filter(season__iexact=season, series=series).all()
+        objekts = self.bot.catalog.in_series(season, series)
 
         if not objekts:
             await interaction.followup.send("No objekts found for the specified season and series.", ephemeral=True)
@@ -502,10 +479,10 @@ class Utility(Plugin):
             end = start + items_per_page
             page_objekts = objekts[start:end]
 
-            filename, description = await self.generate_collage(
+            data, description = await self.generate_collage(
                 season, series, page, page_objekts, grid_size
             )
-            return filename, description
+            return data, description
         
         class PaginationView(View):
             def __init__(self, color):
@@ -514,8 +491,8 @@ class Utility(Plugin):
                 self.color = color
             
             async def update_embed(self, interaction: discord.Interaction):
-                filename, description = await create_collage_for_page(self.current_page)
-                file = discord.File(filename, filename="gallery.png")
+                data, description = await create_collage_for_page(self.current_page)
+                file = discord.File(BytesIO(data), filename="gallery.png")
                 embed = discord.Embed(
                     title=f"tripleS {season[0].capitalize() * int(season[-1])}{series}",
                     description=description,
@@ -535,8 +512,8 @@ class Utility(Plugin):
                 self.current_page = (self.current_page + 1) % total_pages
                 await self.update_embed(interaction)
 
-        filename, description = await create_collage_for_page(current_page)
-        file = discord.File(filename, filename="gallery.png")
+        data, description = await create_collage_for_page(current_page)
+        file = discord.File(BytesIO(data), filename="gallery.png")
         embed = discord.Embed(
             title=f"tripleS {season[0].capitalize() * int(season[-1])}{series}",
             description=description,
@@ -551,38 +528,86 @@ class Utility(Plugin):
     async def como_leaderboard_command(self, interaction: discord.Interaction):
         await interaction.response.defer()
 
-        leaderboard_data = await EconomyModel.all().order_by("-balance", "updated_at").limit(25).values("id", "balance", "updated_at")
+        leaderboard = self.bot.leaderboard
+        names = self.bot.names
+        page_size = 10
 
-        if not leaderboard_data:
+        # one extra row tells whether there is a next page
+        first_page = await leaderboard.como_page(limit=page_size + 1)
+        if not first_page:
             await interaction.followup.send("No como leaderboard data available.", ephemeral=True)
             return
-        
-        leaderboard_data = sorted(leaderboard_data, key=lambda x: (-x["balance"], self.safe_updated_at(x.get("updated_at"))))[:10]
-        
-        embed = discord.Embed(
-            title="GNDSG Slur Gacha Como Leaderboard",
-            description="Here are the 10 richest members:",
-            color=0xFFD700
-        )
 
-        for rank, entry in enumerate(leaderboard_data, start=1):
-            user_id = entry["id"]
-            balance = entry["balance"]
-            user = await self.bot.fetch_user(user_id)
-            user_name = user.name if user else "Unknown User"
-            embed.add_field(
-                name=f"#{rank} {user.name}",
-                value=f"Total Como: {balance:,}",
-                inline=False
+        my_rank = await leaderboard.como_rank(interaction.user.id)
+        footer_rank = f"Your rank: #{my_rank:,}" if my_rank else "Your rank: unranked"
+
+        async def build_embed(rows, page):
+            user_names = await names.resolve(entry["id"] for entry in rows)
+            embed = discord.Embed(
+                title="GNDSG Slur Gacha Como Leaderboard",
+                description="Here are the 10 richest members:" if page == 0 else None,
+                color=0xFFD700
             )
+            for rank, entry in enumerate(rows, start=page * page_size + 1):
+                embed.add_field(
+                    name=f"#{rank} {user_names[entry['id']]}",
+                    value=f"Total Como: {entry['balance']:,}",
+                    inline=False
+                )
+            embed.set_footer(text=f"Page {page + 1} | {footer_rank}")
+            return embed
 
-        await interaction.followup.send(embed=embed)
+        class ComoLeaderboardView(View):
+            def __init__(self, user_id: int):
+                super().__init__()
+                self.user_id = user_id
+                # keyset cursors of every page shown so far, to step back through
+                self.cursors = [None]
+                self.set_rows(first_page)
+
+            def set_rows(self, rows):
+                self.rows = rows[:page_size]
+                self.previous_page.disabled = len(self.cursors) == 1
+                self.next_page.disabled = len(rows) <= page_size
+
+            async def interaction_check(self, interaction: discord.Interaction) -> bool:
+                if interaction.user.id != self.user_id:
+                    await interaction.response.send_message("You cannot use these buttons. They are locked to the command caller.", ephemeral=True)
+                    return False
+                return True
+
+            async def show(self, interaction: discord.Interaction):
+                self.set_rows(await leaderboard.como_page(after=self.cursors[-1], limit=page_size + 1))
+                embed = await build_embed(self.rows, len(self.cursors) - 1)
+                await interaction.response.edit_message(embed=embed, view=self)
+
+            @discord.ui.button(label="◀️ Prev", style=discord.ButtonStyle.gray)
+            async def previous_page(self, interaction: discord.Interaction, button: Button):
+                if len(self.cursors) == 1:
+                    await interaction.response.defer()
+                    return
+                self.cursors.pop()
+                await self.show(interaction)
+
+            @discord.ui.button(label="▶️ Next", style=discord.ButtonStyle.gray)
+            async def next_page(self, interaction: discord.Interaction, button: Button):
+                if self.next_page.disabled:
+                    await interaction.response.defer()
+                    return
+                last = self.rows[-1]
+                self.cursors.append((last["balance"], last["updated_at"], last["id"]))
+                await self.show(interaction)
+
+        view = ComoLeaderboardView(interaction.user.id)
+        embed = await build_embed(view.rows, 0)
+        await interaction.followup.send(embed=embed, view=view)
 
     @app_commands.command(name="leaderboard", description="View the leaderboard of users with the most collected objekts.")
     @app_commands.describe(
         member="Filter the leaderboard by a specific member.",
         season="Filter the leaderboard by a specific season.",
-        mode="Toggle between percent complete or total copies owned."
+        mode="Toggle between percent complete or total copies owned.",
+        page="Which page of 10 to show."
     )
     @app_commands.choices(
         mode=[
@@ -591,29 +616,31 @@ class Utility(Plugin):
         ],
         season=SEASON_CHOICES
     )
-    async def leaderboard_command(self, interaction: discord.Interaction, member: str | None = None, season: app_commands.Choice[str] | None = None, mode: app_commands.Choice[str] = None):
+    async def leaderboard_command(self, interaction: discord.Interaction, member: str | None = None, season: app_commands.Choice[str] | None = None, mode: app_commands.Choice[str] = None, page: app_commands.Range[int, 1] = 1):
         await interaction.response.defer()
 
         if member and season:
             await interaction.followup.send("You can only filter by one of `member` or `season` at a time.", ephemeral=True)
             return
         
-        query = ObjektModel.all()
-        if member:
-            query = query.filter(member__iexact=member)
-        if season:
-            query = query.filter(season__iexact=season.value)
-        
-        total_objekts = await query.all()
-        total_objekts_ids = [objekt.id for objekt in total_objekts]
-        users = await EconomyModel.all()
-        
-        leaderboard_data = await self.generate_leaderboard_data(users, total_objekts_ids, mode)
+        total_objekts = self.bot.catalog.filter(member=member, season=season.value if season else None)
+        leaderboard_data = await self.generate_leaderboard_data(len(total_objekts), mode, member, season, page)
+        if not leaderboard_data:
+            await interaction.followup.send("No leaderboard entries on that page.", ephemeral=True)
+            return
+
+        my_rank = await self.bot.leaderboard.rank(
+            interaction.user.id,
+            member=member,
+            season=season.value if season else None,
+            by=mode.value if mode else "percent"
+        )
 
         embed_title = self.get_leaderboard_title(mode, member, season)
         
         embed = discord.Embed(title=embed_title, color=0xFFD700)
         self.add_leaderboard_fields(embed, leaderboard_data, mode)
+        embed.set_footer(text=f"Page {page} | Your rank: {f'#{my_rank:,}' if my_rank else 'unranked'}")
         
         await interaction.followup.send(embed=embed)
 
@@ -638,33 +665,25 @@ class Utility(Plugin):
             return
         
         target = user or interaction.user
-        user_id = str(target.id)
+        user_id = target.id
         prefix = f"Your ({target})" if not user else f"{user}'s"
 
-        # apply filters
-        query = ObjektModel.all()
-        if member:
-            query = query.filter(member__iexact=member)
-        if season:
-            query = query.filter(season__iexact=season.value)
-        if class_:
-            query = query.filter(class___iexact=class_.value)
-        if rarity:
-            query = query.filter(rarity=rarity.value)
-        if series:
-            query = query.filter(series=series)
-        
-        # fetch objekts based on filters
-        total_objekts = await query.all()
-        total_objekt_ids = [objekt.id for objekt in total_objekts]
-        collected_objekts = await CollectionModel.filter(user_id=user_id, objekt__id__in=total_objekt_ids).prefetch_related("objekt")
-        collected_ids = {entry.objekt.id for entry in collected_objekts}
+        # objekts matching the filters, as a catalog bitmask
+        catalog = self.bot.catalog
+        total_mask = catalog.mask(
+            member=member,
+            season=season.value if season else None,
+            class_=class_.value if class_ else None,
+            rarity=rarity.value if rarity else None,
+            series=series
+        )
+        owned_mask = await self.bot.ownership.get(user_id)
 
         # separate collected from missing
-        collected = [objekt for objekt in total_objekts if objekt.id in collected_ids]
-        missing = [objekt for objekt in total_objekts if objekt.id not in collected_ids]
+        collected = catalog.from_mask(total_mask & owned_mask)
+        missing = catalog.from_mask(total_mask & ~owned_mask)
 
-        total_count = len(total_objekts)
+        total_count = total_mask.bit_count()
         collected_count = len(collected)
         collection_percentage = (collected_count / total_count) * 100 if total_count > 0 else 0
         
@@ -794,90 +813,31 @@ class Utility(Plugin):
         await interaction.response.defer()
 
         user1 = user1 or interaction.user
-        user1_id = str(user1.id)
-        user2_id = str(user2.id)
+        user1_id = user1.id
+        user2_id = user2.id
         
-        # fetch inventory
-        query1 = CollectionModel.filter(user_id=user1_id).prefetch_related("objekt")
-        query2 = CollectionModel.filter(user_id=user2_id).prefetch_related("objekt")
-
-        # filter
-        if filter_by_member:
-            query1 = query1.filter(objekt__member__iexact=filter_by_member)
-            query2 = query2.filter(objekt__member__iexact=filter_by_member)
-        if filter_by_season:
-            query1 = query1.filter(objekt__season__iexact=filter_by_season.value)
-            query2 = query2.filter(objekt__season__iexact=filter_by_season.value)
-        if filter_by_class:
-            query1 = query1.filter(objekt__class_=filter_by_class.value)
-            query2 = query2.filter(objekt__class_=filter_by_class.value)
-        if filter_by_rarity:
-            query1 = query1.filter(objekt__rarity=filter_by_rarity.value)
-            query2 = query2.filter(objekt__rarity=filter_by_rarity.value)
-
-        user1_inventory = await query1
-        user2_inventory = await query2
-
-        def extract_inventory_data(inventory):
-            return [
-                (
-                    entry.objekt.id,
-                    entry.objekt.member,
-                    entry.objekt.season,
-                    entry.objekt.class_,
-                    entry.objekt.series,
-                    entry.objekt.image_url,
-                    entry.objekt.rarity,
-                    entry.copies
-                )
-                for entry in inventory
-            ]
-
-        # extract data for sort
-        user1_objekts = extract_inventory_data(user1_inventory)
-        user2_objekts = extract_inventory_data(user2_inventory)
-
-        # sorting
-        sort_by_value = sort_by.value if sort_by else "member"
-
-        def sort_inventory(data, sort_by, ascending):
-            sort_key_map = {
-                "member": lambda x: x[1].lower(),
-                "season": lambda x: x[2].lower(),
-                "class": lambda x: x[3].lower(),
-                "series": lambda x: x[4].lower(),
-                "rarity": lambda x: x[6],
-                "copies": lambda x: x[7]
-            }
-            return sorted(data, key=sort_key_map.get(sort_by, lambda x: x[1].lower()), reverse=not ascending)
-
-        user1_objekts = sort_inventory(user1_objekts, sort_by_value, ascending)
-        user2_objekts = sort_inventory(user2_objekts, sort_by_value, ascending)
-
-        # differentials
-        user1_only = [objekt for objekt in user1_objekts if objekt[0] not in {obj[0] for obj in user2_objekts}]
-        user2_only = [objekt for objekt in user2_objekts if objekt[0] not in {obj[0] for obj in user1_objekts}]
-
-        # pagination
-        items_per_page = 9
-        total_pages = max(
-            (len(user1_only) + items_per_page - 1) // items_per_page,
-            (len(user2_only) + items_per_page - 1) // items_per_page,
+        # both differences, sorted once and kept for the lifetime of the view
+        comparison = await self.bot.compare.compare(
+            user1_id,
+            user2_id,
+            member=filter_by_member,
+            season=filter_by_season.value if filter_by_season else None,
+            class_=filter_by_class.value if filter_by_class else None,
+            rarity=filter_by_rarity.value if filter_by_rarity else None,
+            sort_by=sort_by.value if sort_by else "member",
+            ascending=ascending
         )
+        total_pages = comparison.total_pages
         current_page = 0
 
-        def get_page_embed(page):
-            start = page * items_per_page
-            end = start + items_per_page
-
-            user1_page_data = user1_only[start:end]
-            user2_page_data = user2_only[start:end]
+        async def get_page_embed(page):
+            user1_page_data, user2_page_data = await comparison.page(page)
 
             user1_field = "\n".join(
-                [f"**{obj[1]}** {obj[2][0] * int(obj[2][-1])}{obj[4]} x{obj[7]}" for obj in user1_page_data]
+                [f"**{objekt.member}** {objekt.season[0] * int(objekt.season[-1])}{objekt.series} x{copies}" for objekt, copies in user1_page_data]
             ) or "None"
             user2_field = "\n".join(
-                [f"**{obj[1]}** {obj[2][0] * int(obj[2][-1])}{obj[4]} x{obj[7]}" for obj in user2_page_data]
+                [f"**{objekt.member}** {objekt.season[0] * int(objekt.season[-1])}{objekt.series} x{copies}" for objekt, copies in user2_page_data]
             ) or "None"
 
             embed = discord.Embed(
@@ -901,7 +861,7 @@ class Utility(Plugin):
                     await interaction.response.send_message("You cannot use these buttons. They are locked to the command caller.", ephemeral=True)
                     return
                 
-                embed = get_page_embed(self.current_page)
+                embed = await get_page_embed(self.current_page)
                 await interaction.response.edit_message(embed=embed, view=self)
 
             @discord.ui.button(label="◀️ Prev", style=discord.ButtonStyle.gray)
@@ -920,7 +880,7 @@ class Utility(Plugin):
                 self.current_page = (self.current_page + 1) % total_pages
                 await self.update_embed(interaction)
             
-        embed = get_page_embed(current_page)
+        embed = await get_page_embed(current_page)
         view = PaginationView(user_id=interaction.user.id)
         await interaction.followup.send(embed=embed, view=view)
 
@@ -943,25 +903,18 @@ class Utility(Plugin):
             await interaction.followup.send(f"{interaction.user.mention} must send more than 0 como.")
             return
         
-        sender_data, _ = await EconomyModel.get_or_create(id=sender_id)
-        recipient_data, _ = await EconomyModel.get_or_create(id=recipient_id)
-
-        if sender_data.balance < amount:
+        balances = await self.bot.ledger.transfer(sender_id, recipient_id, amount)
+        if balances is None:
             await interaction.followup.send(f"{interaction.user.mention} doesn't have enough como to complete their send to {recipient.name}! Broke ahh")
             return
-        
-        async with in_transaction():
-            sender_data.balance -= amount
-            recipient_data.balance += amount
-            await sender_data.save()
-            await recipient_data.save()
+        sender_balance, recipient_balance = balances
 
         embed= await self.create_embed(
             title="Transfer Confirmation",
             description=f"{interaction.user.name} transferred {amount:,} como to {recipient.name}.",
             fields=[
-                ("Sender Balance", f"{interaction.user.name} now has {sender_data.balance:,} como."),
-                ("Recipient Balance", f"{recipient.name} now has {recipient_data.balance:,} como.")
+                ("Sender Balance", f"{interaction.user.name} now has {sender_balance:,} como."),
+                ("Recipient Balance", f"{recipient.name} now has {recipient_balance:,} como.")
             ],
             color=0x00ff00
         )
@@ -981,9 +934,9 @@ class Utility(Plugin):
         if not await self.check_admin_permissions(interaction):
             return
         
-        user_id = str(user.id)
+        user_id = user.id
 
-        all_objekts = await ObjektModel.filter(rarity=rarity.value).all()
+        all_objekts = self.bot.catalog.with_rarity(rarity.value)
         owned_objekts = await CollectionModel.filter(user_id=user_id).values_list("objekt_id", flat=True)
         unowned_objekts = [objekt for objekt in all_objekts if objekt.id not in owned_objekts]
 
@@ -1016,20 +969,20 @@ class Utility(Plugin):
     ):
         await interaction.response.defer()
 
-        sender_id = str(interaction.user.id)
-        recipient_id = str(recipient.id)
+        sender_id = interaction.user.id
+        recipient_id = recipient.id
 
         if sender_id == recipient_id:
             await interaction.followup.send("You cannot send duplicates to yourself!", ephemeral=True)
             return
         
-        sender_inventory = await self.fetch_filtered_inventory(sender_id, member, season, rarity, class_)
-        recipient_inventory = await self.fetch_filtered_inventory(recipient_id, member, season, rarity, class_)
+        sender_duplicates = await self.fetch_filtered_inventory(sender_id, member, season, rarity, class_, min_copies=2)
+        recipient_owned = await self.bot.ownership.get(recipient_id)
 
-        recipient_objekt_ids = {entry.objekt.id for entry in recipient_inventory}
+        catalog = self.bot.catalog
         duplicates_to_send = [
-            entry for entry in sender_inventory
-            if entry.copies > 1 and entry.objekt.id not in recipient_objekt_ids
+            entry for entry in sender_duplicates
+            if not recipient_owned >> catalog.position[entry.objekt.id] & 1
         ]
 
         if not duplicates_to_send:
@@ -1057,6 +1010,16 @@ class Utility(Plugin):
         embed = await self.create_success_embed(interaction.user.name, recipient.name, duplicates_to_send)
         await interaction.followup.send(embed=embed)
         
+    @app_commands.command(name="rebuild_stats", description="(Admin Only) Recompute the collection leaderboard stats.")
+    async def rebuild_stats_command(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        if not await self.check_admin_permissions(interaction):
+            return
+
+        stats = await self.bot.leaderboard.rebuild()
+        await interaction.followup.send(f"Rebuilt stats for **{stats['users']:,}** users in {stats['seconds']}s.", ephemeral=True)
+
     @app_commands.command(name="give_como", description="(Admin Only) Give a user a specific amount of como.")
     @app_commands.describe(user="The user to give como to.",
                            amount="The amount of como to give.")
@@ -1070,12 +1033,12 @@ class Utility(Plugin):
             await interaction.followup.send("The amount of como must be greater than 0.", ephemeral=True)
             return
 
-        user_data = await self.update_user_balance(user.id, amount)
+        balance = await self.update_user_balance(user.id, amount)
 
         embed = await self.create_embed(
             title="Como Given",
             description=f"**{interaction.user.mention}** has given **{amount:,} como** to **{user.mention}**.",
-            fields=[("New Balance", f"{user.name} now has **{user_data.balance:,} como**.")]
+            fields=[("New Balance", f"{user.name} now has **{balance:,} como**.")]
         )
 
         await interaction.followup.send(embed=embed)
@@ -1098,90 +1061,58 @@ class Utility(Plugin):
         filter_by_rarity: app_commands.Choice[int] | None = None,  ascending: bool | None = False
     ):
         target = user or interaction.user
-        user_id = str(target.id)
+        user_id = target.id
         prefix = f"Your ({target})" if not user else f"{user}'s"
 
         await interaction.response.defer()
 
-        inventory = await self.fetch_filtered_inventory(
-            user_id, filter_by_member, filter_by_season, filter_by_rarity, filter_by_class
+        sort_by_value = sort_by.value if sort_by else "updated_at"
+        pages = InventoryPages(
+            self.bot.catalog,
+            user_id,
+            member=filter_by_member,
+            season=filter_by_season.value if filter_by_season else None,
+            class_=filter_by_class.value if filter_by_class else None,
+            rarity=filter_by_rarity.value if filter_by_rarity else None,
+            # this view has always sorted members alphabetically
+            sort_by="member_name" if sort_by_value == "member" else sort_by_value,
+            ascending=ascending
         )
 
-        if not inventory:
+        if not await pages.count():
             await interaction.followup.send(f"{prefix} inventory is empty!")
             return
-        
-        objekt_data = [
-            (
-                entry.objekt.id,
-                entry.objekt.member,
-                entry.objekt.season,
-                entry.objekt.class_,
-                entry.objekt.series,
-                entry.objekt.image_url,
-                entry.objekt.rarity,
-                entry.updated_at,
-                entry.copies,
-                entry.objekt
-            )
-            for entry in inventory
-        ]
-
-        sort_by_value = sort_by.value if sort_by else "updated_at"
 
-        def sort_inventory(data, sort_by, ascending):
-            sort_key_map = {
-                "member": lambda x: x[1].lower(),
-                "season": lambda x: x[2].lower(),
-                "class": lambda x: x[3].lower(),
-                "series": lambda x: x[4].lower(),
-                "rarity": lambda x: x[6],
-                "copies": lambda x: x[8],
-                "updated_at": lambda x: x[7],
-            }
-            return sorted(data, key=sort_key_map.get(sort_by, sort_key_map["updated_at"]), reverse=not ascending)
-        
-        sorted_data = sort_inventory(objekt_data, sort_by_value, ascending)
-        items_per_page = 9
-        total_pages = (len(sorted_data) + items_per_page - 1) // items_per_page
-        current_page = 0
+        total_pages = pages.total_pages
 
-        async def create_collage_for_page(page):
-            start = page * items_per_page
-            end = start + items_per_page
-            page_objekts = sorted_data[start:end]
-            collage_filename = f'collage_{target.name}_page_{page}.png'
-            filename, _ = await self.create_collage([obj[-1] for obj in page_objekts], filename=collage_filename)
+        async def create_collage_for_page(page_objekts):
+            data, _ = await self.create_collage([objekt for objekt, _ in page_objekts])
             desc_lines = [
-                f"**{member}** {season[0] * int(season[-1])}{series} x{copies}"
-                for _, member, season, _, series, _, _, _, copies, _ in page_objekts
+                f"**{objekt.member}** {objekt.season[0] * int(objekt.season[-1])}{objekt.series} x{copies}"
+                for objekt, copies in page_objekts
             ]
             description = "\n".join(desc_lines)
-            return filename, description
+            return data, description
         
         class InventoryImageView(View):
             def __init__(self, user_id: int):
                 super().__init__()
-                self.current_page = 0
                 self.user_id = user_id
             
-            async def update_embed(self, interaction: discord.Interaction):
+            async def update_embed(self, interaction: discord.Interaction, page_objekts):
                 if interaction.user.id != self.user_id:
                     await interaction.response.send_message("You cannot use these buttons. They are locked to the command caller.", ephemeral=True)
                     return
                 try:
-                    collage_path, description = await create_collage_for_page(self.current_page)
-                    with open(collage_path, "rb") as f:
-                        file = discord.File(f, filename="collage.png")
-                        embed = discord.Embed(
-                            title=f"{prefix} Inventory (Page {self.current_page + 1}/{total_pages})",
-                            description=description,
-                            color=0xb19cd9
-                        )
-                        embed.set_image(url="attachment://collage.png")
-                        await interaction.response.edit_message(embed=embed, attachments=[file], view=self)
-                    if os.path.exists(collage_path):
-                        os.remove(collage_path)
+                    data, description = await create_collage_for_page(page_objekts)
+                    file = discord.File(BytesIO(data), filename="collage.png")
+                    embed = discord.Embed(
+                        title=f"{prefix} Inventory (Page {pages.page + 1}/{total_pages})",
+                        description=description,
+                        color=0xb19cd9
+                    )
+                    embed.set_image(url="attachment://collage.png")
+                    await interaction.response.edit_message(embed=embed, attachments=[file], view=self)
                 except discord.errors.NotFound:
                     await interaction.followup.send("This interaction has expired. Please try again.", ephemeral=True)
 
@@ -1190,31 +1121,26 @@ class Utility(Plugin):
                 if interaction.user.id != self.user_id:
                     await interaction.response.send_message("You cannot use these buttons. They are locked to the command caller.", ephemeral=True)
                     return
-                self.current_page = (self.current_page - 1) % total_pages
-                await self.update_embed(interaction)
+                await self.update_embed(interaction, await pages.previous())
             
             @discord.ui.button(label="Next ▶️", style=discord.ButtonStyle.gray)
             async def next_page(self, interaction: discord.Interaction, button: Button):
                 if interaction.user.id != self.user_id:
                     await interaction.response.send_message("You cannot use these buttons. They are locked to the command caller.", ephemeral=True)
                     return
-                self.current_page = (self.current_page + 1) % total_pages
-                await self.update_embed(interaction)
+                await self.update_embed(interaction, await pages.next())
             
-        collage_path, description = await create_collage_for_page(current_page)
-        with open(collage_path, "rb") as f:
-            file = discord.File(f, filename="collage.png")
-            embed = discord.Embed(
-                title=f"{prefix} Inventory (Page {current_page + 1}/{total_pages})",
-                description=description,
-                color=0xb19cd9
-            )
-            embed.set_image(url="attachment://collage.png")
+        data, description = await create_collage_for_page(await pages.first())
+        file = discord.File(BytesIO(data), filename="collage.png")
+        embed = discord.Embed(
+            title=f"{prefix} Inventory (Page {pages.page + 1}/{total_pages})",
+            description=description,
+            color=0xb19cd9
+        )
+        embed.set_image(url="attachment://collage.png")
 
-            view = InventoryImageView(user_id=interaction.user.id)
-            await interaction.followup.send(embed=embed, file=file, view=view)
-        if os.path.exists(collage_path):
-            os.remove(collage_path)
+        view = InventoryImageView(user_id=interaction.user.id)
+        await interaction.followup.send(embed=embed, file=file, view=view)
 
     @app_commands.command(name="inv_text", description="View your or another user's inventory in text-only format. Dynamic sort available.")
     @app_commands.describe(
@@ -1233,64 +1159,42 @@ class Utility(Plugin):
         filter_by_rarity: app_commands.Choice[int] | None = None,  ascending: bool | None = False
     ):
         target = user or interaction.user
-        user_id = str(target.id)
+        user_id = target.id
         prefix = f"Your ({target})" if not user else f"{user}'s"
 
         await interaction.response.defer()
 
-        inventory = await self.fetch_filtered_inventory(
-            user_id, filter_by_member, filter_by_season, filter_by_rarity, filter_by_class
+        current_sort = sort_by.value if sort_by else "updated_at"
+
+        def sort_key(sort_by):
+            # the default order here has always been by objekt id
+            return "objekt_id" if sort_by == "updated_at" else sort_by
+
+        pages = InventoryPages(
+            self.bot.catalog,
+            user_id,
+            member=filter_by_member,
+            season=filter_by_season.value if filter_by_season else None,
+            class_=filter_by_class.value if filter_by_class else None,
+            rarity=filter_by_rarity.value if filter_by_rarity else None,
+            sort_by=sort_key(current_sort),
+            ascending=ascending
         )
 
-        if not inventory:
+        if not await pages.count():
             await interaction.followup.send(f"{prefix} inventory is empty!")
             return
-        
-        objekt_data = [
-            (
-                entry.objekt.id,
-                entry.objekt.member,
-                entry.objekt.season,
-                entry.objekt.class_,
-                entry.objekt.series,
-                entry.objekt.image_url,
-                entry.objekt.rarity,
-                entry.copies,
-                entry.objekt
-            )
-            for entry in inventory
-        ]
-
-        items_per_page = 9
-        total_pages = (len(objekt_data) + items_per_page - 1) // items_per_page
-        current_page = 0
-        current_sort = sort_by.value if sort_by else "updated_at"
 
-        def sort_inventory(data, sort_by, ascending):
-            sort_key_map = {
-                "member": lambda x: MEMBER_PRIORITY.get(x[1], float('inf')),
-                "season": lambda x: x[2].lower(),
-                "class": lambda x: x[3].lower(),
-                "series": lambda x: x[4].lower(),
-                "rarity": lambda x: x[6],
-                "copies": lambda x: x[7],
-                "updated_at": lambda x: x[0],
-            }
-            return sorted(data, key=sort_key_map.get(sort_by, sort_key_map["updated_at"]), reverse=not ascending)
+        total_pages = pages.total_pages
         
-        def get_page_embed(page, sort_by, ascending):
-            sorted_data = sort_inventory(objekt_data, sort_by, ascending)
-            start = page * items_per_page
-            end = start + items_per_page
-            page_objekts = sorted_data[start:end]
-
+        def get_page_embed(page_objekts, sort_by, ascending):
             desc_lines = [
-                f"**{member}** {season[0] * int(season[-1])}{series} x{copies}"
-                for _, member, season, _, series, _, _, copies, _ in page_objekts
+                f"**{objekt.member}** {objekt.season[0] * int(objekt.season[-1])}{objekt.series} x{copies}"
+                for objekt, copies in page_objekts
             ]
 
             embed = discord.Embed(
-                title=f"{prefix} Inventory (Page {page + 1}/{total_pages})",
+                title=f"{prefix} Inventory (Page {pages.page + 1}/{total_pages})",
                 description='\n'.join(desc_lines) if desc_lines else "No items on this page.",
                 color=0xb19cd9
             )
@@ -1300,13 +1204,16 @@ class Utility(Plugin):
         class InventoryView(View):
             def __init__(self, user_id: int):
                 super().__init__()
-                self.current_page = 0
                 self.current_sort = current_sort
                 self.ascending = ascending
                 self.user_id = user_id
             
-            async def update_embed(self, interaction: discord.Interaction):
-                embed = get_page_embed(self.current_page, self.current_sort, self.ascending)
+            async def update_embed(self, interaction: discord.Interaction, page_objekts=None):
+                if page_objekts is None:
+                    # the order changed, start again from the top
+                    pages.set_sort(sort_key(self.current_sort), self.ascending)
+                    page_objekts = await pages.first()
+                embed = get_page_embed(page_objekts, self.current_sort, self.ascending)
                 await interaction.response.edit_message(embed=embed, view=self)
             
             @discord.ui.button(label="◀️ Prev", style=discord.ButtonStyle.gray)
@@ -1314,16 +1221,14 @@ class Utility(Plugin):
                 if interaction.user.id != self.user_id:
                     await interaction.response.send_message("You cannot use these buttons. They are locked to the command caller.", ephemeral=True)
                     return
-                self.current_page = (self.current_page - 1) % total_pages
-                await self.update_embed(interaction)
+                await self.update_embed(interaction, await pages.previous())
 
             @discord.ui.button(label="Next ▶️", style=discord.ButtonStyle.gray)
             async def next_page(self, interaction: discord.Interaction, button: Button):
                 if interaction.user.id != self.user_id:
                     await interaction.response.send_message("You cannot use these buttons. They are locked to the command caller.", ephemeral=True)
                     return
-                self.current_page = (self.current_page + 1) % total_pages
-                await self.update_embed(interaction)
+                await self.update_embed(interaction, await pages.next())
 
             @discord.ui.button(label="Sort by Member", style=discord.ButtonStyle.blurple)
             async def sort_by_member(self, interaction: discord.Interaction, button: Button):
@@ -1381,7 +1286,7 @@ class Utility(Plugin):
                 self.ascending = not self.ascending
                 await self.update_embed(interaction)
 
-        embed = get_page_embed(current_page, current_sort, ascending)
+        embed = get_page_embed(await pages.first(), current_sort, ascending)
         view = InventoryView(user_id=interaction.user.id)
         await interaction.followup.send(embed=embed, view=view)
 
@@ -1403,9 +1308,7 @@ class Utility(Plugin):
         if not await self.check_admin_permissions(interaction):
             return
         
-        user_data, _ = await EconomyModel.get_or_create(id=user.id)
-        user_data.balance = 0
-        await user_data.save()
+        await self.bot.ledger.set(user.id, 0)
 
         embed = await self.create_embed(
             title="Como Reset",
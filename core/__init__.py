@@ -1,3 +1,20 @@
 from .bot import *
 from .embed import *
-from .models import *
\ No newline at end of file
+from .models import *
+from .catalog import *
+from .sampler import *
+from .inventory import *
+from .ledger import *
+from .cache import *
+from .cooldowns import *
+from .ratelimit import *
+from .shop import *
+from .leaderboard import *
+from .names import *
+from .ownership import *
+from .compare import *
+from .inventory_pages import *
+from .migrations import *
+from .images import *
+from .thumbnails import *
+from .render import *
@@ -6,6 +6,22 @@ import sys
 
 from typing import Optional, Union
 from .embed import Embed
+from .catalog import Catalog
+from .sampler import SpinSampler
+from .inventory import Inventory
+from .ledger import Ledger
+from .cooldowns import Cooldowns
+from .ratelimit import RateLimiter
+from .shop import Shop
+from .leaderboard import Leaderboard
+from .names import NameCache
+from .ownership import Ownership
+from .compare import InventoryCompare
+from .images import ImageFetcher
+from .thumbnails import ThumbnailCache
+from .render import RenderPool, RenderCache
+from .constants import RENDER_WORKERS, RENDER_PROCESSES
+from .migrations import migrate
 from discord.ext import commands
 from logging import getLogger
 from tortoise import Tortoise
@@ -29,6 +45,14 @@ async def reload(ctx, extension):
     await ctx.bot.load_extension(f'cogs.{extension}.plugin')
     await ctx.send(f'Reloaded {extension}.plugin')
 
+@commands.command(name="reload_catalog")
+@commands.is_owner()
+async def reload_catalog(ctx):
+    await ctx.bot.catalog.load()
+    ctx.bot.shop.invalidate()
+    ctx.bot.render_cache.invalidate()
+    await ctx.send(f"Catalog reloaded ({len(ctx.bot.catalog)} objekts).")
+
 class Bot(commands.AutoShardedBot):
     def __init__(self):
         super().__init__(
@@ -36,6 +60,21 @@ class Bot(commands.AutoShardedBot):
             intents=discord.Intents.all(),
             chunk_guild_at_startup=False
         )
+        self.catalog = Catalog()
+        self.sampler = SpinSampler(self.catalog)
+        self.ledger = Ledger()
+        self.cooldowns = Cooldowns()
+        self.ratelimits = RateLimiter()
+        self.shop = Shop(self.catalog)
+        self.leaderboard = Leaderboard()
+        self.ownership = Ownership(self.catalog)
+        self.inventory = Inventory(self.catalog, self.leaderboard, self.ownership)
+        self.compare = InventoryCompare(self.catalog, self.ownership)
+        self.names = NameCache(self)
+        self.images = ImageFetcher()
+        self.thumbnails = ThumbnailCache(self.images)
+        self.renderer = RenderPool(RENDER_WORKERS, processes=RENDER_PROCESSES)
+        self.render_cache = RenderCache(self.catalog)
     
     async def setup_hook(self) -> None:
         await Tortoise.init(
@@ -45,6 +84,11 @@ class Bot(commands.AutoShardedBot):
             }
         )
         await Tortoise.generate_schemas(safe=True)
+        await migrate()
+        await self.leaderboard.ensure_schema()
+        await self.catalog.load()
+        await self.shop.load()
+        self.ratelimits.start()
         for file in os.listdir('cogs'):
             if not file.startswith("_"):
                 await self.load_extension(f"cogs.{file}.plugin")
@@ -54,6 +98,16 @@ class Bot(commands.AutoShardedBot):
 
         self.add_command(sync)
         self.add_command(reload)
+        self.add_command(reload_catalog)
+
+    async def close(self) -> None:
+        try:
+            await self.ratelimits.close()
+        except Exception as e:
+            log.error(f"Failed to flush rate limits on shutdown: {e}")
+        await self.images.close()
+        self.renderer.close()
+        await super().close()
 
     async def on_ready(self) -> None:
         log.info(f"Logged in as {self.user} (ID: {self.user.id})")
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, TypeVar
+
+__all__ = ("LRUCache",)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[K, V]):
+    """Small in-process LRU map with optional TTL and byte budget.
+
+    `maxsize` bounds the number of entries, `max_bytes` bounds the summed
+    `sizeof(value)` of all entries; whichever is hit first evicts the least
+    recently used entries. Entries older than `ttl` seconds read as missing.
+    """
+
+    def __init__(
+        self,
+        maxsize: int | None = 1024,
+        *,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[V], int] | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._data: OrderedDict[K, tuple[V, float, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self._lookup(key, touch=False) is not _MISSING
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(list(self._data))
+
+    def _lookup(self, key: K, *, touch: bool):
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        value, stored_at, _ = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            self.pop(key)
+            return _MISSING
+        if touch:
+            self._data.move_to_end(key)
+        return value
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        value = self._lookup(key, touch=True)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def peek(self, key: K, default: V | None = None) -> V | None:
+        """Read without touching recency or the hit counters."""
+        value = self._lookup(key, touch=False)
+        return default if value is _MISSING else value
+
+    def set(self, key: K, value: V) -> None:
+        self.pop(key)
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._data[key] = (value, time.monotonic(), size)
+        self.bytes += size
+        self._evict()
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self.bytes -= entry[2]
+        return entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.bytes = 0
+
+    def _evict(self) -> None:
+        while self._data and (
+            (self.maxsize is not None and len(self._data) > self.maxsize)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._data.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
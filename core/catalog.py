@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import random
+from logging import getLogger
+from typing import Iterable, Iterator
+
+from .models import ObjektModel
+
+log = getLogger(__name__)
+
+__all__ = ("ObjektRecord", "Catalog")
+
+_FIELDS = (
+    "id", "slug", "objekt_name", "season", "member", "series",
+    "class_", "image_url", "background_color", "rarity", "front_media",
+)
+
+
+class ObjektRecord:
+    """Read-only, in-memory copy of an `objekts` row.
+
+    Exposes the same attribute names as `ObjektModel` so it can be passed
+    anywhere the cogs previously used a fetched model instance.
+    """
+
+    __slots__ = _FIELDS
+
+    def __init__(self, **values) -> None:
+        for name in _FIELDS:
+            setattr(self, name, values.get(name))
+
+    def __repr__(self) -> str:
+        return f"<ObjektRecord id={self.id} slug={self.slug!r}>"
+
+
+def _norm(value: str | None) -> str | None:
+    return value.lower() if value is not None else None
+
+
+class Catalog:
+    """Bot-wide index of the `objekts` table, loaded once at startup.
+
+    Season and member keys are stored lowercased so lookups behave like
+    the `__iexact` filters they replace.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._clear()
+
+    def _clear(self) -> None:
+        self.by_id: dict[int, ObjektRecord] = {}
+        self.by_slug: dict[str, ObjektRecord] = {}
+        self.by_rarity: dict[int, list[ObjektRecord]] = {}
+        self.by_season_rarity: dict[tuple[str | None, int], list[ObjektRecord]] = {}
+        self.by_season_series: dict[tuple[str | None, str | None], list[ObjektRecord]] = {}
+        self.by_member: dict[str | None, list[ObjektRecord]] = {}
+        # bit i of every mask stands for records[i]
+        self.records: list[ObjektRecord] = []
+        self.position: dict[int, int] = {}
+        self.masks: dict[tuple[str, str | int | None], int] = {}
+        self.all_mask = 0
+
+    async def load(self) -> None:
+        rows = await ObjektModel.all().order_by("id").values(*_FIELDS)
+
+        self._clear()
+        for row in rows:
+            self._index(ObjektRecord(**row))
+
+        self.version += 1
+        log.info(f"Loaded {len(self.by_id)} objekts into the catalog (version {self.version}).")
+
+    def _index(self, record: ObjektRecord) -> None:
+        season = _norm(record.season)
+        self.by_id[record.id] = record
+        if record.slug:
+            self.by_slug[record.slug.lower()] = record
+        self.by_rarity.setdefault(record.rarity, []).append(record)
+        self.by_season_rarity.setdefault((season, record.rarity), []).append(record)
+        self.by_season_series.setdefault((season, record.series), []).append(record)
+        self.by_member.setdefault(_norm(record.member), []).append(record)
+
+        bit = 1 << len(self.records)
+        self.position[record.id] = len(self.records)
+        self.records.append(record)
+        self.all_mask |= bit
+        for key in (
+            ("member", _norm(record.member)),
+            ("season", season),
+            ("class", _norm(record.class_)),
+            ("rarity", record.rarity),
+            ("series", record.series),
+        ):
+            self.masks[key] = self.masks.get(key, 0) | bit
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[ObjektRecord]:
+        return iter(self.by_id.values())
+
+    def get(self, objekt_id: int) -> ObjektRecord | None:
+        return self.by_id.get(objekt_id)
+
+    def get_by_slug(self, slug: str | None) -> ObjektRecord | None:
+        if not slug:
+            return None
+        return self.by_slug.get(slug.lower())
+
+    def find(self, season: str, member: str, series: str) -> ObjektRecord | None:
+        member = member.lower()
+        for record in self.by_season_series.get((season.lower(), series), ()):
+            if _norm(record.member) == member:
+                return record
+        return None
+
+    def with_rarity(self, rarity: int, season: str | None = None) -> list[ObjektRecord]:
+        if season is None:
+            return self.by_rarity.get(rarity, [])
+        return self.by_season_rarity.get((season.lower(), rarity), [])
+
+    def in_series(self, season: str, series: str) -> list[ObjektRecord]:
+        return self.by_season_series.get((season.lower(), series), [])
+
+    def random_by_rarity(self, rarity: int, rng: random.Random | None = None) -> ObjektRecord | None:
+        objekts = self.by_rarity.get(rarity)
+        return (rng or random).choice(objekts) if objekts else None
+
+    def mask(
+        self,
+        *,
+        member: str | None = None,
+        season: str | None = None,
+        class_: str | None = None,
+        rarity: int | None = None,
+        series: str | None = None,
+    ) -> int:
+        """Bitmask of the objekts `filter` would return for the same arguments."""
+        mask = self.all_mask
+        for key, value in (
+            ("member", _norm(member)),
+            ("season", _norm(season)),
+            ("class", _norm(class_)),
+            ("rarity", rarity),
+            ("series", series),
+        ):
+            if value is not None:
+                mask &= self.masks.get((key, value), 0)
+        return mask
+
+    def bits(self, objekt_ids: Iterable[int]) -> int:
+        """Bitmask of the given objekt ids; ids missing from the catalog are skipped."""
+        # set bits in a buffer and convert once; or-ing into an int per id is quadratic
+        buffer = bytearray((len(self.records) + 7) // 8)
+        for objekt_id in objekt_ids:
+            position = self.position.get(objekt_id)
+            if position is not None:
+                buffer[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(buffer, "little")
+
+    def from_mask(self, mask: int) -> list[ObjektRecord]:
+        """Records whose bits are set, in catalog (id) order."""
+        digits = bin(mask)[:1:-1]
+        return [self.records[i] for i, digit in enumerate(digits) if digit == "1"]
+
+    def filter(
+        self,
+        *,
+        member: str | None = None,
+        season: str | None = None,
+        class_: str | None = None,
+        rarity: int | None = None,
+        series: str | None = None,
+    ) -> list[ObjektRecord]:
+        if member is not None:
+            objekts = self.by_member.get(member.lower(), [])
+        elif season is not None and rarity is not None:
+            objekts = self.by_season_rarity.get((season.lower(), rarity), [])
+        elif season is not None and series is not None:
+            objekts = self.by_season_series.get((season.lower(), series), [])
+        elif rarity is not None:
+            objekts = self.by_rarity.get(rarity, [])
+        else:
+            objekts = list(self.by_id.values())
+
+        season, class_ = _norm(season), _norm(class_)
+        return [
+            objekt for objekt in objekts
+            if (season is None or _norm(objekt.season) == season)
+            and (class_ is None or _norm(objekt.class_) == class_)
+            and (rarity is None or objekt.rarity == rarity)
+            and (series is None or objekt.series == series)
+        ]
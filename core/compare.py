@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from tortoise import connections
+
+from .catalog import Catalog, ObjektRecord
+from .inventory import CollectionEntry
+from .ownership import Ownership
+
+__all__ = ("InventoryCompare", "Comparison")
+
+
+def _text(value: str | None) -> str:
+    return (value or "").lower()
+
+
+_SORT_KEYS = {
+    "member": lambda record: _text(record.member),
+    "season": lambda record: _text(record.season),
+    "class": lambda record: _text(record.class_),
+    "series": lambda record: _text(record.series),
+    "rarity": lambda record: record.rarity,
+}
+
+
+class Comparison:
+    """The two one-sided differences between a pair of inventories.
+
+    Both sides are held as sorted lists of catalog records; copy counts are
+    fetched a page at a time (or all at once when sorting by copies) and
+    kept for the lifetime of the object, so paging back and forth is free.
+    """
+
+    def __init__(self, user1_id: int, user2_id: int, only1: list[ObjektRecord], only2: list[ObjektRecord], page_size: int) -> None:
+        self.user1_id = user1_id
+        self.user2_id = user2_id
+        self.only1 = only1
+        self.only2 = only2
+        self.page_size = page_size
+        self._copies: dict[tuple[int, int], int] = {}
+
+    @property
+    def total_pages(self) -> int:
+        return max(-(-len(self.only1) // self.page_size), -(-len(self.only2) // self.page_size), 1)
+
+    async def _load_copies(self, ids1: list[int], ids2: list[int]) -> None:
+        ids1 = [i for i in ids1 if (self.user1_id, i) not in self._copies]
+        ids2 = [i for i in ids2 if (self.user2_id, i) not in self._copies]
+        if not ids1 and not ids2:
+            return
+        rows = await connections.get("default").execute_query_dict(
+            """
+            SELECT user_id, objekt_id, copies FROM collections
+            WHERE (user_id = $1 AND objekt_id = ANY($2::int[]))
+               OR (user_id = $3 AND objekt_id = ANY($4::int[]))
+            """,
+            [self.user1_id, ids1, self.user2_id, ids2]
+        )
+        for row in rows:
+            self._copies[(row["user_id"], row["objekt_id"])] = row["copies"]
+
+    async def sort_by_copies(self, ascending: bool) -> None:
+        await self._load_copies([r.id for r in self.only1], [r.id for r in self.only2])
+        self.only1.sort(key=lambda r: self._copies.get((self.user1_id, r.id), 0), reverse=not ascending)
+        self.only2.sort(key=lambda r: self._copies.get((self.user2_id, r.id), 0), reverse=not ascending)
+
+    async def page(self, page: int) -> tuple[list[CollectionEntry], list[CollectionEntry]]:
+        """Both sides' entries for a 0-based page."""
+        start = page * self.page_size
+        side1 = self.only1[start:start + self.page_size]
+        side2 = self.only2[start:start + self.page_size]
+        await self._load_copies([r.id for r in side1], [r.id for r in side2])
+        return (
+            [CollectionEntry(r, self._copies.get((self.user1_id, r.id), 0)) for r in side1],
+            [CollectionEntry(r, self._copies.get((self.user2_id, r.id), 0)) for r in side2],
+        )
+
+
+class InventoryCompare:
+    """Builds `Comparison`s from cached ownership bitmaps.
+
+    Each difference is one `a & ~b` over the catalog bitmaps, linear in the
+    catalog size, instead of a membership scan per element.
+    """
+
+    def __init__(self, catalog: Catalog, ownership: Ownership) -> None:
+        self.catalog = catalog
+        self.ownership = ownership
+
+    async def compare(
+        self,
+        user1_id: int | str,
+        user2_id: int | str,
+        *,
+        member: str | None = None,
+        season: str | None = None,
+        class_: str | None = None,
+        rarity: int | None = None,
+        sort_by: str = "member",
+        ascending: bool = False,
+        page_size: int = 9
+    ) -> Comparison:
+        mask = self.catalog.mask(member=member, season=season, class_=class_, rarity=rarity)
+        owned1 = await self.ownership.get(user1_id) & mask
+        owned2 = await self.ownership.get(user2_id) & mask
+
+        only1 = self.catalog.from_mask(owned1 & ~owned2)
+        only2 = self.catalog.from_mask(owned2 & ~owned1)
+        comparison = Comparison(int(user1_id), int(user2_id), only1, only2, page_size)
+
+        if sort_by == "copies":
+            await comparison.sort_by_copies(ascending)
+        else:
+            key = _SORT_KEYS.get(sort_by, _SORT_KEYS["member"])
+            only1.sort(key=key, reverse=not ascending)
+            only2.sort(key=key, reverse=not ascending)
+        return comparison
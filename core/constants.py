@@ -97,6 +97,25 @@ BANNER_CHOICES = [
     app_commands.Choice(name="rateup", value="rateup")
 ]
 
+SPIN_RARITY_WEIGHTS = {
+    6: 0.003,
+    5: 0.03,
+    4: 0.067,
+    3: 0.1,
+    2: 0.2,
+    1: 0.6,
+}
+
+RATEUP_SEASON = "Binary02"
+FILLER_SEASON = "GNDSG01"
+FILLER_SEASON_WEIGHT = 0.7
+
+SPIN_COUNT_CHOICES = [
+    app_commands.Choice(name="1", value=1),
+    app_commands.Choice(name="10", value=10),
+    app_commands.Choice(name="50", value=50)
+]
+
 RARITY_STR_MAPPING = {
     1: "n ",
     2: "n ",
@@ -116,6 +135,15 @@ SHOP_BUY_VALUES = {
     5: 2000,
     6: 10000,
 }
+# "lazy" derives each user's shop on first view from (user_id, UTC date);
+# "nightly" materializes every user's shop into the shop table at midnight
+SHOP_MODE = "lazy"
+
+# collage rendering pool; falls back to threads where processes are unavailable
+RENDER_WORKERS = 2
+RENDER_PROCESSES = True
+# also keep rendered /series_template pages under collage/series so they survive restarts
+PERSIST_SERIES_COLLAGES = False
 
 SLURS = [
     "Faggot",
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from tortoise import connections
+
+from .cache import LRUCache
+from .ledger import STARTING_BALANCE
+from .models import CooldownModel
+
+__all__ = ("Cooldowns",)
+
+
+def _uid(user_id: int | str) -> int:
+    return int(user_id)
+
+
+class Cooldowns:
+    """Per-user command cooldowns backed by `cooldowns` with an in-process TTL cache.
+
+    A user's cooldowns are loaded with one query and kept for `ttl` seconds;
+    writes go straight to the cache and are persisted with an upsert, so
+    reminder footers cost no queries while the entry is warm.
+    """
+
+    def __init__(self, *, ttl: float = 600, maxsize: int = 10_000) -> None:
+        self._cache: LRUCache[int, dict[str, datetime | None]] = LRUCache(maxsize, ttl=ttl)
+
+    async def get_all(self, user_id: int | str) -> dict[str, datetime | None]:
+        key = _uid(user_id)
+        cooldowns = self._cache.get(key)
+        if cooldowns is None:
+            rows = await CooldownModel.filter(user_id=key).values_list("command", "expires_at")
+            cooldowns = dict(rows)
+            self._cache.set(key, cooldowns)
+        return cooldowns
+
+    async def get(self, user_id: int | str, command: str) -> datetime | None:
+        return (await self.get_all(user_id)).get(command)
+
+    async def set(self, user_id: int | str, command: str, expires_at: datetime) -> None:
+        key = _uid(user_id)
+        await connections.get("default").execute_query(
+            """
+            WITH owner AS (
+                INSERT INTO economy (id, balance, created_at, updated_at)
+                VALUES ($1, $4, now(), now())
+                ON CONFLICT (id) DO NOTHING
+            )
+            INSERT INTO cooldowns (user_id, command, expires_at)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (user_id, command) DO UPDATE SET expires_at = EXCLUDED.expires_at
+            """,
+            [key, command, expires_at, STARTING_BALANCE]
+        )
+        cooldowns = self._cache.peek(key)
+        if cooldowns is not None:
+            cooldowns[command] = expires_at
+
+    async def ready(self, user_id: int | str, now: datetime, commands: list[str]) -> list[str]:
+        """Capitalised names of the given commands that are off cooldown."""
+        cooldowns = await self.get_all(user_id)
+        return [
+            command.capitalize() for command in commands
+            if not cooldowns.get(command) or cooldowns[command] <= now
+        ]
+
+    def invalidate(self, user_id: int | str | None = None) -> None:
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(_uid(user_id))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from logging import getLogger
+from typing import Iterable, Mapping, NamedTuple
+
+import aiohttp
+
+log = getLogger(__name__)
+
+__all__ = ("ImageFetcher", "ImageResponse")
+
+# worth another attempt; anything else in 4xx will not change on retry
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class ImageResponse(NamedTuple):
+    status: int
+    body: bytes | None
+    etag: str | None
+    last_modified: str | None
+
+
+class ImageFetcher:
+    """Bot-wide image downloader for collages.
+
+    One long-lived `aiohttp.ClientSession` keeps connections to the image
+    CDN alive and caches its DNS lookups between renders. `fetch_many`
+    downloads every image of a collage concurrently, at most `concurrency`
+    at a time, so a page costs roughly its slowest image instead of the sum
+    of all of them. Timeouts, connection errors and retryable statuses are
+    retried with jittered exponential backoff; an image that still fails
+    comes back as None so the collage can leave its slot empty.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 8,
+        timeout: float = 10,
+        retries: int = 2,
+        backoff: float = 0.5,
+        dns_ttl: int = 300
+    ) -> None:
+        self.concurrency = concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.dns_ttl = dns_ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # created on first use so it binds to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency * 2, ttl_dns_cache=self.dns_ttl)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def get(self, url: str | None, headers: Mapping[str, str] | None = None) -> ImageResponse | None:
+        """One GET with retries; a 304 counts as success. None once every attempt has failed."""
+        if not url:
+            return None
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._semaphore:
+                    async with self.session.get(url, headers=headers) as response:
+                        if response.status not in _RETRY_STATUSES:
+                            if response.status != 304:
+                                response.raise_for_status()
+                            return ImageResponse(
+                                response.status,
+                                await response.read() if response.status != 304 else None,
+                                response.headers.get("ETag"),
+                                response.headers.get("Last-Modified")
+                            )
+                        error: Exception = aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
+            except aiohttp.ClientResponseError as e:
+                log.warning(f"Error loading image from {url}: {e}")
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+        log.warning(f"Error loading image from {url} after {self.retries + 1} attempts: {error!r}")
+        return None
+
+    async def fetch(self, url: str | None) -> bytes | None:
+        """The body at `url`, or None if it could not be downloaded."""
+        response = await self.get(url)
+        return response.body if response is not None else None
+
+    async def fetch_many(self, urls: Iterable[str | None]) -> list[bytes | None]:
+        """Bodies for every url, in order, fetched concurrently."""
+        return list(await asyncio.gather(*(self.fetch(url) for url in urls)))
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterable, Mapping, NamedTuple
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from .catalog import Catalog, ObjektRecord
+from .leaderboard import Leaderboard
+from .ledger import STARTING_BALANCE
+from .ownership import Ownership
+
+__all__ = ("Inventory", "CollectionEntry", "COLLECTION_FILTER")
+
+# `collections AS c JOIN objekts AS o` restricted to user $1 and the optional
+# member ($2), season ($3), rarity ($4) and class ($5) filters
+COLLECTION_FILTER = """
+    c.user_id = $1
+    AND ($2::text IS NULL OR o.member_lower = lower($2))
+    AND ($3::text IS NULL OR o.season_lower = lower($3))
+    AND ($4::int IS NULL OR o.rarity = $4)
+    AND ($5::text IS NULL OR o.class_lower = lower($5))
+"""
+
+
+# users whose collection changed inside the current `Inventory.transaction()`
+_touched: ContextVar[set[int] | None] = ContextVar("inventory_touched", default=None)
+
+
+def _uid(user_id: int | str) -> int:
+    return int(user_id)
+
+
+class CollectionEntry(NamedTuple):
+    """One owned objekt: the catalog record plus the user's copy count."""
+    objekt: ObjektRecord
+    copies: int
+
+
+class Inventory:
+    """Atomic mutations of the `collections` table.
+
+    Every grant is a single `INSERT ... ON CONFLICT DO UPDATE` so concurrent
+    grants can neither lose increments nor trip the (user_id, objekt_id)
+    unique constraint. All methods take an optional `using_db` so callers
+    can fold them into a wider transaction. When `stats` is given, the
+    leaderboard stats are updated in the same transaction as each change;
+    when `ownership` is given, changed users' cached bitmaps are dropped
+    again once the outermost `transaction()` commits, so the cache never
+    holds rows that were rolled back or not yet visible.
+    """
+
+    def __init__(self, catalog: Catalog | None = None, stats: Leaderboard | None = None, ownership: Ownership | None = None) -> None:
+        self.catalog = catalog
+        self.stats = stats
+        self.ownership = ownership
+
+    async def entries(
+        self,
+        user_id: int | str,
+        *,
+        member: str | None = None,
+        season: str | None = None,
+        rarity: int | None = None,
+        class_: str | None = None,
+        min_copies: int = 1
+    ) -> list[CollectionEntry]:
+        """A user's collection as `(objekt, copies)` pairs, reading only the two columns needed."""
+        rows = await connections.get("default").execute_query_dict(
+            f"""
+            SELECT c.objekt_id, c.copies
+            FROM collections AS c JOIN objekts AS o ON o.id = c.objekt_id
+            WHERE {COLLECTION_FILTER} AND c.copies >= $6
+            ORDER BY c.id
+            """,
+            [_uid(user_id), member, season, rarity, class_, min_copies]
+        )
+        get = self.catalog.get
+        return [
+            CollectionEntry(objekt, row["copies"])
+            for row in rows
+            if (objekt := get(row["objekt_id"])) is not None
+        ]
+
+    async def rarity_summary(self, user_id: int | str, leave: int) -> dict[int, dict[str, int]]:
+        """Unique objekts and copies above `leave` per rarity, aggregated in the database."""
+        rows = await connections.get("default").execute_query_dict(
+            """
+            SELECT o.rarity, COUNT(*) AS "unique", SUM(GREATEST(c.copies - $2, 0)) AS dupes
+            FROM collections AS c JOIN objekts AS o ON o.id = c.objekt_id
+            WHERE c.user_id = $1
+            GROUP BY o.rarity
+            """,
+            [_uid(user_id), leave]
+        )
+        return {row["rarity"]: {"unique": row["unique"], "dupes": row["dupes"]} for row in rows}
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[BaseDBAsyncClient]:
+        """`in_transaction()` that invalidates changed users' ownership after commit.
+
+        Callers that fold inventory changes into a wider transaction should
+        open it with this instead of `in_transaction()`.
+        """
+        if _touched.get() is not None:
+            async with in_transaction() as connection:
+                yield connection
+            return
+
+        touched: set[int] = set()
+        token = _touched.set(touched)
+        try:
+            async with in_transaction() as connection:
+                yield connection
+        finally:
+            _touched.reset(token)
+            if self.ownership is not None:
+                for user_id in touched:
+                    self.ownership.invalidate(user_id)
+
+    async def _record(self, user_id: int | str, deltas: dict[int, tuple[int, int]], using_db: BaseDBAsyncClient) -> None:
+        """Apply `objekt_id -> (owned delta, copies delta)` to the leaderboard stats and ownership cache."""
+        if not deltas:
+            return
+        if self.ownership is not None:
+            self.ownership.invalidate(user_id)
+            touched = _touched.get()
+            if touched is not None:
+                touched.add(_uid(user_id))
+        if self.stats is None:
+            return
+        await self.stats.apply(
+            user_id,
+            deltas,
+            [owned for owned, _ in deltas.values()],
+            [copies for _, copies in deltas.values()],
+            using_db=using_db
+        )
+
+    async def add(self, user_id: int | str, objekt_id: int, copies: int = 1, *, using_db: BaseDBAsyncClient | None = None) -> int:
+        """Give a user `copies` of an objekt. Returns their new copy count."""
+        result = await self.add_many(user_id, {objekt_id: copies}, using_db=using_db)
+        return result[objekt_id]
+
+    async def add_many(self, user_id: int | str, counts: Mapping[int, int], *, using_db: BaseDBAsyncClient | None = None) -> dict[int, int]:
+        """Multi-row grant of `objekt_id -> copies`. Returns the new copy counts."""
+        if not counts:
+            return {}
+        if using_db is None:
+            async with self.transaction() as connection:
+                return await self.add_many(user_id, counts, using_db=connection)
+
+        # xmax = 0 only for freshly inserted rows, i.e. newly owned objekts;
+        # the owner CTE creates the economy row the foreign key needs
+        rows = await using_db.execute_query_dict(
+            """
+            WITH owner AS (
+                INSERT INTO economy (id, balance, created_at, updated_at)
+                VALUES ($1, $4, now(), now())
+                ON CONFLICT (id) DO NOTHING
+            )
+            INSERT INTO collections (user_id, objekt_id, copies, created_at, updated_at)
+            SELECT $1, t.objekt_id, t.copies, now(), now()
+            FROM unnest($2::int[], $3::int[]) AS t(objekt_id, copies)
+            ON CONFLICT (user_id, objekt_id)
+            DO UPDATE SET copies = collections.copies + EXCLUDED.copies, created_at = EXCLUDED.created_at
+            RETURNING objekt_id, copies, (xmax = 0) AS inserted
+            """,
+            [_uid(user_id), list(counts), list(counts.values()), STARTING_BALANCE]
+        )
+        await self._record(user_id, {row["objekt_id"]: (int(row["inserted"]), counts[row["objekt_id"]]) for row in rows}, using_db)
+        return {row["objekt_id"]: row["copies"] for row in rows}
+
+    async def remove_many(self, user_id: int | str, counts: Mapping[int, int], *, using_db: BaseDBAsyncClient | None = None) -> dict[int, int]:
+        """Take copies away from a user, deleting rows that reach zero.
+
+        Rows the user does not hold enough copies of are left untouched and
+        missing from the result, so callers can tell what actually moved.
+        """
+        if not counts:
+            return {}
+        if using_db is None:
+            async with self.transaction() as connection:
+                return await self.remove_many(user_id, counts, using_db=connection)
+
+        rows = await using_db.execute_query_dict(
+            """
+            UPDATE collections AS c
+            SET copies = c.copies - t.copies, created_at = now()
+            FROM unnest($2::int[], $3::int[]) AS t(objekt_id, copies)
+            WHERE c.user_id = $1 AND c.objekt_id = t.objekt_id AND c.copies >= t.copies
+            RETURNING c.objekt_id, c.copies
+            """,
+            [_uid(user_id), list(counts), list(counts.values())]
+        )
+        emptied = [row["objekt_id"] for row in rows if row["copies"] <= 0]
+        if emptied:
+            await using_db.execute_query(
+                "DELETE FROM collections WHERE user_id = $1 AND objekt_id = ANY($2::int[]) AND copies <= 0",
+                [_uid(user_id), emptied]
+            )
+        await self._record(
+            user_id,
+            {row["objekt_id"]: (-1 if row["copies"] <= 0 else 0, -counts[row["objekt_id"]]) for row in rows},
+            using_db
+        )
+        return {row["objekt_id"]: max(row["copies"], 0) for row in rows}
+
+    async def remove(self, user_id: int | str, objekt_id: int, copies: int = 1, *, using_db: BaseDBAsyncClient | None = None) -> int | None:
+        """Take copies of one objekt away. Returns the remaining count, or None if the user had too few."""
+        result = await self.remove_many(user_id, {objekt_id: copies}, using_db=using_db)
+        return result.get(objekt_id)
+
+    async def transfer(self, sender_id: int | str, recipient_id: int | str, objekt_id: int, copies: int = 1, *, using_db: BaseDBAsyncClient | None = None) -> int | None:
+        """Move copies between users atomically. Returns the recipient's new count, or None if the sender had too few."""
+        if using_db is None:
+            async with self.transaction() as connection:
+                return await self.transfer(sender_id, recipient_id, objekt_id, copies, using_db=connection)
+
+        if await self.remove(sender_id, objekt_id, copies, using_db=using_db) is None:
+            return None
+        return await self.add(recipient_id, objekt_id, copies, using_db=using_db)
+
+    async def trim(self, user_id: int | str, objekt_ids: Iterable[int], leave: int, *, using_db: BaseDBAsyncClient | None = None) -> dict[int, int]:
+        """Cut every listed objekt down to `leave` copies. Returns how many copies were removed per objekt."""
+        objekt_ids = list(objekt_ids)
+        if not objekt_ids:
+            return {}
+        if using_db is None:
+            async with self.transaction() as connection:
+                return await self.trim(user_id, objekt_ids, leave, using_db=connection)
+
+        connection = using_db
+        if leave <= 0:
+            rows = await connection.execute_query_dict(
+                """
+                DELETE FROM collections
+                WHERE user_id = $1 AND objekt_id = ANY($2::int[])
+                RETURNING objekt_id, copies AS removed
+                """,
+                [_uid(user_id), objekt_ids]
+            )
+        else:
+            rows = await connection.execute_query_dict(
+                """
+                UPDATE collections AS c
+                SET copies = $3, created_at = now()
+                FROM (
+                    SELECT id, copies FROM collections
+                    WHERE user_id = $1 AND objekt_id = ANY($2::int[]) AND copies > $3
+                    FOR UPDATE
+                ) AS old
+                WHERE c.id = old.id
+                RETURNING c.objekt_id, old.copies - $3 AS removed
+                """,
+                [_uid(user_id), objekt_ids, leave]
+            )
+        owned = -1 if leave <= 0 else 0
+        await self._record(user_id, {row["objekt_id"]: (owned, -row["removed"]) for row in rows}, connection)
+        return {row["objekt_id"]: row["removed"] for row in rows}
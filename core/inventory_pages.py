@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from tortoise import connections
+
+from .catalog import Catalog
+from .constants import MEMBER_PRIORITY
+from .inventory import COLLECTION_FILTER, CollectionEntry
+
+__all__ = ("InventoryPages",)
+
+# member names in MEMBER_PRIORITY order; unknown members sort after all of them
+_MEMBER_ORDER = sorted(MEMBER_PRIORITY, key=MEMBER_PRIORITY.get)
+
+_SORT_EXPRESSIONS = {
+    "member": "COALESCE(array_position({members}::text[], o.member), 2147483647)",
+    "member_name": "COALESCE(o.member_lower, '')",
+    "season": "COALESCE(o.season_lower, '')",
+    "class": "COALESCE(o.class_lower, '')",
+    "series": "COALESCE(lower(o.series), '')",
+    "rarity": "o.rarity",
+    "copies": "c.copies",
+    "updated_at": "c.updated_at",
+    "objekt_id": "c.objekt_id",
+}
+
+
+class InventoryPages:
+    """Keyset-paginated, filtered and sorted view of one user's collection.
+
+    Filters and sort order run in SQL and each page reads only its own rows,
+    continuing from the (sort key, row id) of the first or last row on the
+    current page. Prev/Next wrap around like the other paginators; jumping
+    from the first page to the last reads the tail in reverse order.
+    """
+
+    def __init__(
+        self,
+        catalog: Catalog,
+        user_id: int | str,
+        *,
+        member: str | None = None,
+        season: str | None = None,
+        class_: str | None = None,
+        rarity: int | None = None,
+        sort_by: str = "updated_at",
+        ascending: bool = False,
+        page_size: int = 9
+    ) -> None:
+        self.catalog = catalog
+        self.user_id = int(user_id)
+        self.filters = [member, season, rarity, class_]
+        self.page_size = page_size
+        self.total = 0
+        self.page = 0
+        self._first: tuple | None = None
+        self._last: tuple | None = None
+        self.set_sort(sort_by, ascending)
+
+    @property
+    def total_pages(self) -> int:
+        return max(-(-self.total // self.page_size), 1)
+
+    def set_sort(self, sort_by: str, ascending: bool) -> None:
+        """Change the order; the next read should be `first()`."""
+        self.sort_by = sort_by if sort_by in _SORT_EXPRESSIONS else "updated_at"
+        self.ascending = ascending
+
+    def _where(self) -> tuple[str, list]:
+        return COLLECTION_FILTER, [self.user_id, *self.filters]
+
+    async def count(self) -> int:
+        where, params = self._where()
+        rows = await connections.get("default").execute_query_dict(
+            f"SELECT COUNT(*) AS total FROM collections AS c JOIN objekts AS o ON o.id = c.objekt_id WHERE {where}",
+            params
+        )
+        self.total = rows[0]["total"]
+        return self.total
+
+    async def _fetch(self, *, after: tuple | None = None, reverse: bool = False, limit: int | None = None) -> list[CollectionEntry]:
+        where, params = self._where()
+        expression = _SORT_EXPRESSIONS[self.sort_by]
+        if "{members}" in expression:
+            params.append(_MEMBER_ORDER)
+            expression = expression.format(members=f"${len(params)}")
+
+        # walking backwards flips both the order and the keyset comparison
+        forward = self.ascending != reverse
+        direction = "ASC" if forward else "DESC"
+        if after is not None:
+            params.extend(after)
+            where += f" AND ({expression}, c.id) {'>' if forward else '<'} (${len(params) - 1}, ${len(params)})"
+        params.append(limit or self.page_size)
+
+        rows = await connections.get("default").execute_query_dict(
+            f"""
+            SELECT c.id, c.objekt_id, c.copies, {expression} AS sort_key
+            FROM collections AS c JOIN objekts AS o ON o.id = c.objekt_id
+            WHERE {where}
+            ORDER BY sort_key {direction}, c.id {direction}
+            LIMIT ${len(params)}
+            """,
+            params
+        )
+        if reverse:
+            rows.reverse()
+        if rows:
+            self._first = (rows[0]["sort_key"], rows[0]["id"])
+            self._last = (rows[-1]["sort_key"], rows[-1]["id"])
+        get = self.catalog.get
+        return [
+            CollectionEntry(objekt, row["copies"])
+            for row in rows
+            if (objekt := get(row["objekt_id"])) is not None
+        ]
+
+    async def first(self) -> list[CollectionEntry]:
+        self.page = 0
+        return await self._fetch()
+
+    async def last(self) -> list[CollectionEntry]:
+        self.page = self.total_pages - 1
+        return await self._fetch(reverse=True, limit=self.total - self.page * self.page_size or self.page_size)
+
+    async def next(self) -> list[CollectionEntry]:
+        if self.page + 1 >= self.total_pages:
+            return await self.first()
+        self.page += 1
+        return await self._fetch(after=self._last)
+
+    async def previous(self) -> list[CollectionEntry]:
+        if self.page == 0:
+            return await self.last()
+        self.page -= 1
+        return await self._fetch(after=self._first, reverse=True)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import time
+from logging import getLogger
+from typing import Iterable
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+log = getLogger(__name__)
+
+__all__ = ("Leaderboard",)
+
+
+class Leaderboard:
+    """Collection rankings read from incrementally maintained stats tables.
+
+    `user_stats` holds each user's unique objekts and total copies, and
+    `user_group_stats` the same per season and per member. `Inventory`
+    calls `apply` in the same transaction as every collection change, so
+    rankings are an index range scan instead of an aggregate over
+    `collections`. `rebuild` recomputes both tables from scratch.
+
+    The como board reads `economy` directly through its
+    (balance DESC, updated_at, id) index; the indexes themselves are
+    created by `core.migrations`.
+    """
+
+    async def ensure_schema(self) -> None:
+        """Backfill the stats tables on first run."""
+        rows = await connections.get("default").execute_query_dict(
+            "SELECT NOT EXISTS (SELECT 1 FROM user_stats) AND EXISTS (SELECT 1 FROM collections) AS empty"
+        )
+        if rows[0]["empty"]:
+            await self.rebuild()
+
+    async def apply(
+        self,
+        user_id: int | str,
+        objekt_ids: Iterable[int],
+        owned: Iterable[int],
+        copies: Iterable[int],
+        *,
+        using_db: BaseDBAsyncClient
+    ) -> None:
+        """Add per-objekt deltas of owned (+1/0/-1) and copies to a user's stats."""
+        objekt_ids = list(objekt_ids)
+        if not objekt_ids:
+            return
+        await using_db.execute_query(
+            """
+            WITH d AS (
+                SELECT d.owned, d.copies, o.season_lower AS season, o.member_lower AS member
+                FROM unnest($2::int[], $3::int[], $4::int[]) AS d(objekt_id, owned, copies)
+                JOIN objekts AS o ON o.id = d.objekt_id
+            ), totals AS (
+                INSERT INTO user_stats (user_id, unique_owned, total_copies)
+                SELECT $1, COALESCE(SUM(owned), 0), COALESCE(SUM(copies), 0) FROM d
+                ON CONFLICT (user_id) DO UPDATE SET
+                    unique_owned = user_stats.unique_owned + EXCLUDED.unique_owned,
+                    total_copies = user_stats.total_copies + EXCLUDED.total_copies
+            )
+            INSERT INTO user_group_stats (user_id, kind, key, unique_owned, copies)
+            SELECT $1, 'season', season, SUM(owned), SUM(copies) FROM d WHERE season IS NOT NULL GROUP BY season
+            UNION ALL
+            SELECT $1, 'member', member, SUM(owned), SUM(copies) FROM d WHERE member IS NOT NULL GROUP BY member
+            ON CONFLICT (user_id, kind, key) DO UPDATE SET
+                unique_owned = user_group_stats.unique_owned + EXCLUDED.unique_owned,
+                copies = user_group_stats.copies + EXCLUDED.copies
+            """,
+            [int(user_id), objekt_ids, list(owned), list(copies)]
+        )
+
+    async def rebuild(self) -> dict[str, float]:
+        """Recompute every user's stats from `collections`."""
+        started = time.perf_counter()
+        async with in_transaction() as connection:
+            await connection.execute_query("DELETE FROM user_group_stats")
+            await connection.execute_query("DELETE FROM user_stats")
+            await connection.execute_query(
+                """
+                INSERT INTO user_stats (user_id, unique_owned, total_copies)
+                SELECT user_id, COUNT(*), SUM(copies) FROM collections GROUP BY user_id
+                """
+            )
+            await connection.execute_query(
+                """
+                INSERT INTO user_group_stats (user_id, kind, key, unique_owned, copies)
+                SELECT c.user_id, 'season', o.season_lower, COUNT(*), SUM(c.copies)
+                FROM collections AS c JOIN objekts AS o ON o.id = c.objekt_id
+                WHERE o.season IS NOT NULL
+                GROUP BY c.user_id, o.season_lower
+                UNION ALL
+                SELECT c.user_id, 'member', o.member_lower, COUNT(*), SUM(c.copies)
+                FROM collections AS c JOIN objekts AS o ON o.id = c.objekt_id
+                WHERE o.member IS NOT NULL
+                GROUP BY c.user_id, o.member_lower
+                """
+            )
+            rows = await connection.execute_query_dict("SELECT COUNT(*) AS users FROM user_stats")
+
+        stats = {"users": rows[0]["users"], "seconds": round(time.perf_counter() - started, 3)}
+        log.info(f"Rebuilt collection stats for {stats['users']} users in {stats['seconds']}s.")
+        return stats
+
+    @staticmethod
+    def _source(member: str | None, season: str | None, by: str) -> tuple[str, str, str, list]:
+        """The table (plus filter), ranking column, copies column and leading params for a board."""
+        if member is None and season is None:
+            copies = "total_copies"
+            source, params = "user_stats", []
+        else:
+            copies = "copies"
+            kind, key = ("member", member) if member is not None else ("season", season)
+            source, params = "user_group_stats WHERE kind = $1 AND key = lower($2)", [kind, key]
+        # percent complete orders the same as unique owned for a fixed filter
+        metric = copies if by == "copies" else "unique_owned"
+        return source, metric, copies, params
+
+    async def top(
+        self,
+        *,
+        member: str | None = None,
+        season: str | None = None,
+        by: str = "percent",
+        limit: int = 10,
+        offset: int = 0
+    ) -> list[dict]:
+        """Rows of `user_id`, `unique_owned` and `copies`, best first."""
+        source, metric, copies, params = self._source(member, season, by)
+        n = len(params)
+        return await connections.get("default").execute_query_dict(
+            f"""
+            SELECT user_id, unique_owned, {copies} AS copies FROM {source}
+            {"AND" if params else "WHERE"} unique_owned > 0
+            ORDER BY {metric} DESC, user_id
+            LIMIT ${n + 1} OFFSET ${n + 2}
+            """,
+            params + [limit, offset]
+        )
+
+    async def rank(
+        self,
+        user_id: int | str,
+        *,
+        member: str | None = None,
+        season: str | None = None,
+        by: str = "percent"
+    ) -> int | None:
+        """A user's 1-based position on the board, or None if they are not on it."""
+        source, metric, _, params = self._source(member, season, by)
+        n = len(params)
+        where = "AND" if params else "WHERE"
+        rows = await connections.get("default").execute_query_dict(
+            f"""
+            WITH me AS (SELECT {metric} AS value FROM {source} {where} user_id = ${n + 1} AND unique_owned > 0)
+            SELECT COUNT(*) + 1 AS rank FROM {source} {where} unique_owned > 0
+            AND ({metric} > (SELECT value FROM me) OR ({metric} = (SELECT value FROM me) AND user_id < ${n + 1}))
+            HAVING EXISTS (SELECT 1 FROM me)
+            """,
+            params + [int(user_id)]
+        )
+        return rows[0]["rank"] if rows else None
+
+    async def como_page(self, *, after: tuple | None = None, limit: int = 10) -> list[dict]:
+        """Rows of `id`, `balance` and `updated_at`, richest first.
+
+        `after` is the `(balance, updated_at, id)` of the last row already
+        shown; the next page is read from the index starting at that key
+        instead of skipping over an OFFSET.
+        """
+        connection = connections.get("default")
+        if after is None:
+            return await connection.execute_query_dict(
+                "SELECT id, balance, updated_at FROM economy ORDER BY balance DESC, updated_at, id LIMIT $1",
+                [limit]
+            )
+        return await connection.execute_query_dict(
+            """
+            SELECT id, balance, updated_at FROM economy
+            WHERE balance < $1 OR (balance = $1 AND (updated_at, id) > ($2, $3))
+            ORDER BY balance DESC, updated_at, id
+            LIMIT $4
+            """,
+            [*after, limit]
+        )
+
+    async def como_rank(self, user_id: int | str) -> int | None:
+        """A user's `RANK() OVER (ORDER BY balance DESC, updated_at)`, or None without a balance.
+
+        Counted as 1 + the rows ahead of them, which the index answers
+        without ranking the whole table.
+        """
+        rows = await connections.get("default").execute_query_dict(
+            """
+            WITH me AS (SELECT balance, updated_at FROM economy WHERE id = $1)
+            SELECT COUNT(*) + 1 AS rank FROM economy, me
+            WHERE economy.balance > me.balance
+               OR (economy.balance = me.balance AND economy.updated_at < me.updated_at)
+            HAVING EXISTS (SELECT 1 FROM me)
+            """,
+            [int(user_id)]
+        )
+        return rows[0]["rank"] if rows else None
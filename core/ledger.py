@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+__all__ = ("Ledger", "STARTING_BALANCE")
+
+STARTING_BALANCE = 100
+
+
+class Ledger:
+    """Atomic como balance operations on the `economy` table.
+
+    Each operation is a single `UPDATE ... RETURNING balance` (or an upsert
+    for users without a row yet), so concurrent commands never overwrite
+    each other's changes.
+    """
+
+    @staticmethod
+    def _connection(using_db: BaseDBAsyncClient | None) -> BaseDBAsyncClient:
+        return using_db or connections.get("default")
+
+    async def credit(self, user_id: int | str, amount: int, *, using_db: BaseDBAsyncClient | None = None) -> int:
+        """Add `amount` to a user's balance, creating their row if needed. Returns the new balance."""
+        rows = await self._connection(using_db).execute_query_dict(
+            """
+            INSERT INTO economy (id, balance, created_at, updated_at)
+            VALUES ($1, $2::bigint + $3::bigint, now(), now())
+            ON CONFLICT (id) DO UPDATE SET balance = economy.balance + $3
+            RETURNING balance
+            """,
+            [int(user_id), STARTING_BALANCE, amount]
+        )
+        return rows[0]["balance"]
+
+    async def debit(self, user_id: int | str, amount: int, *, using_db: BaseDBAsyncClient | None = None) -> int | None:
+        """Take `amount` only if the user can afford it. Returns the new balance, or None for insufficient funds."""
+        connection = self._connection(using_db)
+        query = "UPDATE economy SET balance = balance - $2 WHERE id = $1 AND balance >= $2 RETURNING balance"
+        rows = await connection.execute_query_dict(query, [int(user_id), amount])
+        if not rows and await self.ensure(user_id, using_db=connection):
+            # brand new user, retry against their starting balance
+            rows = await connection.execute_query_dict(query, [int(user_id), amount])
+        return rows[0]["balance"] if rows else None
+
+    async def withdraw(self, user_id: int | str, amount: int, *, using_db: BaseDBAsyncClient | None = None) -> tuple[int, int]:
+        """Take up to `amount`, never going below zero. Returns `(taken, new_balance)`."""
+        rows = await self._connection(using_db).execute_query_dict(
+            """
+            UPDATE economy AS e
+            SET balance = e.balance - LEAST(old.balance, $2)
+            FROM (SELECT id, balance FROM economy WHERE id = $1 FOR UPDATE) AS old
+            WHERE e.id = old.id
+            RETURNING LEAST(old.balance, $2) AS taken, e.balance
+            """,
+            [int(user_id), max(amount, 0)]
+        )
+        if not rows:
+            return 0, 0
+        return rows[0]["taken"], rows[0]["balance"]
+
+    async def transfer(self, sender_id: int | str, recipient_id: int | str, amount: int, *, using_db: BaseDBAsyncClient | None = None) -> tuple[int, int] | None:
+        """Move como between users. Returns both new balances, or None if the sender can't afford it."""
+        if using_db is None:
+            async with in_transaction() as connection:
+                return await self.transfer(sender_id, recipient_id, amount, using_db=connection)
+
+        sender_balance = await self.debit(sender_id, amount, using_db=using_db)
+        if sender_balance is None:
+            return None
+        recipient_balance = await self.credit(recipient_id, amount, using_db=using_db)
+        return sender_balance, recipient_balance
+
+    async def set(self, user_id: int | str, balance: int, *, using_db: BaseDBAsyncClient | None = None) -> int:
+        rows = await self._connection(using_db).execute_query_dict(
+            """
+            INSERT INTO economy (id, balance, created_at, updated_at)
+            VALUES ($1, $2, now(), now())
+            ON CONFLICT (id) DO UPDATE SET balance = EXCLUDED.balance
+            RETURNING balance
+            """,
+            [int(user_id), balance]
+        )
+        return rows[0]["balance"]
+
+    async def ensure(self, user_id: int | str, *, using_db: BaseDBAsyncClient | None = None) -> bool:
+        """Create the user's row if it is missing. Returns True if it was created."""
+        rows = await self._connection(using_db).execute_query_dict(
+            """
+            INSERT INTO economy (id, balance, created_at, updated_at)
+            VALUES ($1, $2, now(), now())
+            ON CONFLICT (id) DO NOTHING
+            RETURNING id
+            """,
+            [int(user_id), STARTING_BALANCE]
+        )
+        return bool(rows)
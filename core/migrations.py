@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+from logging import getLogger
+
+from tortoise import connections
+from tortoise.transactions import in_transaction
+
+log = getLogger(__name__)
+
+__all__ = ("MIGRATIONS", "migrate", "check_plans")
+
+# arbitrary key so shards starting together apply migrations one at a time
+_LOCK_KEY = 0x5353_5541
+
+# (version, name, statements); append only, never edit an applied entry
+MIGRATIONS: list[tuple[int, str, tuple[str, ...]]] = [
+    (1, "hot path indexes and normalized objekt columns", (
+        # lowercase copies of the case-insensitive filter columns
+        "ALTER TABLE objekts ADD COLUMN IF NOT EXISTS member_lower TEXT GENERATED ALWAYS AS (lower(member)) STORED",
+        "ALTER TABLE objekts ADD COLUMN IF NOT EXISTS season_lower TEXT GENERATED ALWAYS AS (lower(season)) STORED",
+        "ALTER TABLE objekts ADD COLUMN IF NOT EXISTS class_lower TEXT GENERATED ALWAYS AS (lower(\"class\")) STORED",
+        "CREATE UNIQUE INDEX IF NOT EXISTS objekts_slug_key ON objekts (slug)",
+        "CREATE INDEX IF NOT EXISTS objekts_rarity_idx ON objekts (rarity)",
+        "CREATE INDEX IF NOT EXISTS objekts_season_rarity_idx ON objekts (season_lower, rarity)",
+        "CREATE INDEX IF NOT EXISTS objekts_season_series_idx ON objekts (season_lower, series)",
+        "CREATE INDEX IF NOT EXISTS objekts_member_idx ON objekts (member_lower)",
+        "CREATE INDEX IF NOT EXISTS objekts_class_idx ON objekts (class_lower)",
+        "CREATE INDEX IF NOT EXISTS collections_user_id_idx ON collections (user_id, id)",
+        "CREATE INDEX IF NOT EXISTS collections_user_updated_idx ON collections (user_id, updated_at, id)",
+        "CREATE INDEX IF NOT EXISTS triviasessionmodel_active_idx ON triviasessionmodel (user_id) WHERE is_active",
+        "CREATE INDEX IF NOT EXISTS shop_user_id_idx ON shop (user_id, id)",
+        "CREATE INDEX IF NOT EXISTS economy_balance_rank_idx ON economy (balance DESC, updated_at, id)",
+        "CREATE INDEX IF NOT EXISTS user_stats_unique_rank_idx ON user_stats (unique_owned DESC, user_id)",
+        "CREATE INDEX IF NOT EXISTS user_stats_copies_rank_idx ON user_stats (total_copies DESC, user_id)",
+        "CREATE INDEX IF NOT EXISTS user_group_stats_unique_rank_idx ON user_group_stats (kind, key, unique_owned DESC, user_id)",
+        "CREATE INDEX IF NOT EXISTS user_group_stats_copies_rank_idx ON user_group_stats (kind, key, copies DESC, user_id)",
+    )),
+    (2, "bigint user ids with foreign keys to economy", (
+        # the foreign keys need an economy row for everyone who already has data
+        """
+        INSERT INTO economy (id, balance, created_at, updated_at)
+        SELECT user_id, 100, now(), now() FROM (
+            SELECT user_id::bigint FROM collections
+            UNION SELECT user_id::bigint FROM cooldowns
+            UNION SELECT user_id::bigint FROM pity
+        ) AS u(user_id)
+        ON CONFLICT (id) DO NOTHING
+        """,
+        # keep the newest pity row where one user was stored under two spellings
+        """
+        DELETE FROM pity AS p USING pity AS newer
+        WHERE p.user_id::bigint = newer.user_id::bigint AND p.id < newer.id
+        """,
+        "ALTER TABLE collections ALTER COLUMN user_id TYPE BIGINT USING user_id::bigint",
+        "ALTER TABLE cooldowns ALTER COLUMN user_id TYPE BIGINT USING user_id::bigint",
+        "ALTER TABLE pity ALTER COLUMN user_id TYPE BIGINT USING user_id::bigint",
+        "ALTER TABLE collections ADD CONSTRAINT collections_user_id_fkey FOREIGN KEY (user_id) REFERENCES economy (id) ON DELETE CASCADE",
+        "ALTER TABLE cooldowns ADD CONSTRAINT cooldowns_user_id_fkey FOREIGN KEY (user_id) REFERENCES economy (id) ON DELETE CASCADE",
+        "ALTER TABLE pity ADD CONSTRAINT pity_user_id_fkey FOREIGN KEY (user_id) REFERENCES economy (id) ON DELETE CASCADE",
+    )),
+    (3, "rate limiter state out of the cooldowns table", (
+        # the table itself comes from RateLimitModel; this moves over the buckets
+        # the rate limiter used to keep next to the real cooldowns
+        """
+        INSERT INTO rate_limits (user_id, bucket, full_at)
+        SELECT user_id, command, expires_at FROM cooldowns
+        WHERE command IN ('spin', 'slots', 'trivia') AND expires_at IS NOT NULL
+        ON CONFLICT (user_id, bucket) DO NOTHING
+        """,
+        "DELETE FROM cooldowns WHERE command IN ('spin', 'slots', 'trivia')",
+    )),
+]
+
+
+async def migrate() -> list[int]:
+    """Apply every migration newer than the database, in order. Returns the versions applied."""
+    connection = connections.get("default")
+    await connection.execute_script(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+
+    applied = []
+    async with in_transaction() as transaction:
+        await transaction.execute_query("SELECT pg_advisory_xact_lock($1)", [_LOCK_KEY])
+        rows = await transaction.execute_query_dict("SELECT version FROM schema_migrations")
+        done = {row["version"] for row in rows}
+        for version, name, statements in MIGRATIONS:
+            if version in done:
+                continue
+            for statement in statements:
+                await transaction.execute_script(statement)
+            await transaction.execute_query(
+                "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)", [version, name]
+            )
+            log.info(f"Applied migration {version}: {name}")
+            applied.append(version)
+    return applied
+
+
+# (description, query, params, index the planner should pick)
+PLAN_CHECKS: list[tuple[str, str, list, str]] = [
+    ("objekts by rarity", "SELECT id FROM objekts WHERE rarity = $1", [1], "objekts_rarity_idx"),
+    ("objekts by season and rarity", "SELECT id FROM objekts WHERE season_lower = $1 AND rarity = $2", ["binary01", 1], "objekts_season_rarity_idx"),
+    ("objekts by member", "SELECT id FROM objekts WHERE member_lower = $1", ["seoyeon"], "objekts_member_idx"),
+    ("objekt by slug", "SELECT id FROM objekts WHERE slug = $1", ["x"], "objekts_slug_key"),
+    ("collection page", "SELECT id FROM collections WHERE user_id = $1 ORDER BY id LIMIT 9", [0], "collections_user_id_idx"),
+    ("active trivia session", "SELECT id FROM triviasessionmodel WHERE user_id = $1 AND is_active", [0], "triviasessionmodel_active_idx"),
+    ("shop items", "SELECT id FROM shop WHERE user_id = $1 ORDER BY id", [0], "shop_user_id_idx"),
+    ("como leaderboard", "SELECT id FROM economy ORDER BY balance DESC, updated_at, id LIMIT 10", [], "economy_balance_rank_idx"),
+    ("collection leaderboard", "SELECT user_id FROM user_stats ORDER BY unique_owned DESC, user_id LIMIT 10", [], "user_stats_unique_rank_idx"),
+]
+
+
+def _index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        names |= _index_names(child)
+    return names
+
+
+async def check_plans() -> list[tuple[str, str, bool]]:
+    """EXPLAIN each hot query and report whether the expected index is used.
+
+    Sequential scans are disabled for the check, since on a small local
+    database the planner would rightly prefer them; what is verified is
+    that each predicate can be served by its index.
+    """
+    results = []
+    async with in_transaction() as transaction:
+        await transaction.execute_script("SET LOCAL enable_seqscan = off")
+        for description, query, params, index in PLAN_CHECKS:
+            rows = await transaction.execute_query_dict(f"EXPLAIN (FORMAT JSON) {query}", params)
+            plan = rows[0]["QUERY PLAN"]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            results.append((description, index, index in _index_names(plan[0]["Plan"])))
+    return results
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+
+    from tortoise import Tortoise
+
+    from config import HOST, NAME, PASSWORD, PORT, USER
+
+    async def main() -> int:
+        await Tortoise.init(
+            db_url=f"postgres://{USER}:{PASSWORD}@{HOST}:{PORT}/{NAME}",
+            modules={"models": ["core.models"]}
+        )
+        try:
+            await Tortoise.generate_schemas(safe=True)
+            print(f"Applied migrations: {await migrate() or 'none'}")
+            if "--check" not in sys.argv:
+                return 0
+            failed = 0
+            for description, index, used in await check_plans():
+                print(f"{'ok  ' if used else 'FAIL'} {description}: {index}")
+                failed += not used
+            return 1 if failed else 0
+        finally:
+            await Tortoise.close_connections()
+
+    sys.exit(asyncio.run(main()))
@@ -4,7 +4,7 @@ import discord
 from tortoise.models import Model
 from tortoise import fields
 
-__all__ = ("EconomyModel", "ObjektModel", "CollectionModel", "CooldownModel", "ShopModel", "PityModel", "TriviaSessionModel", "TriviaStatsModel")
+__all__ = ("EconomyModel", "ObjektModel", "CollectionModel", "CooldownModel", "RateLimitModel", "ShopModel", "ShopPurchaseModel", "ShopStateModel", "PityModel", "UserStatsModel", "UserGroupStatsModel", "TriviaSessionModel", "TriviaStatsModel")
 
 class EconomyModel(Model):
     id: int = fields.BigIntField(pk=True, unique=True)
@@ -32,7 +32,7 @@ class ObjektModel(Model):
 
 class CollectionModel(Model):
     id: int = fields.IntField(pk=True)
-    user_id: str = fields.TextField()
+    user_id: int = fields.BigIntField()
     objekt: fields.ForeignKeyRelation["ObjektModel"] = fields.ForeignKeyField(
         "models.ObjektModel", related_name="collections", on_delete=fields.CASCADE
     )
@@ -45,7 +45,7 @@ class CollectionModel(Model):
 
 class CooldownModel(Model):
     id: int = fields.IntField(pk=True)
-    user_id: str = fields.TextField()
+    user_id: int = fields.BigIntField()
     command: str = fields.TextField()
     expires_at = fields.DatetimeField(null=True)
 
@@ -53,6 +53,16 @@ class CooldownModel(Model):
         table = "cooldowns"
         unique_together = ("user_id", "command")
 
+class RateLimitModel(Model):
+    id: int = fields.IntField(pk=True)
+    user_id: int = fields.BigIntField()
+    bucket: str = fields.TextField()
+    full_at = fields.DatetimeField()
+
+    class Meta:
+        table = "rate_limits"
+        unique_together = ("user_id", "bucket")
+
 class ShopModel(Model):
     id: int = fields.IntField(pk=True)
     user_id = fields.BigIntField()
@@ -62,9 +72,28 @@ class ShopModel(Model):
 
     class Meta:
         table = "shop"
+
+class ShopPurchaseModel(Model):
+    id: int = fields.IntField(pk=True)
+    user_id = fields.BigIntField()
+    objekt = fields.ForeignKeyField("models.ObjektModel", related_name="shop_purchases", on_delete=fields.CASCADE)
+    price: int = fields.IntField()
+    idempotency_key: str = fields.CharField(max_length=100, unique=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "shop_purchases"
+
+class ShopStateModel(Model):
+    id: int = fields.IntField(pk=True)
+    day = fields.DateField()
+    salt: int = fields.IntField(default=0)
+
+    class Meta:
+        table = "shop_state"
     
 class PityModel(Model):
-    user_id = fields.CharField(max_length=50, unique=True)
+    user_id = fields.BigIntField(unique=True)
     pity_count = fields.IntField(default=0)
     chase_objekt_slug = fields.CharField(max_length=100, null=True)
     chase_pity_count = fields.IntField(default=0)
@@ -73,6 +102,26 @@ class PityModel(Model):
     class Meta:
         table = "pity"
 
+class UserStatsModel(Model):
+    user_id: int = fields.BigIntField(pk=True)
+    unique_owned: int = fields.IntField(default=0)
+    total_copies: int = fields.IntField(default=0)
+
+    class Meta:
+        table = "user_stats"
+
+class UserGroupStatsModel(Model):
+    id: int = fields.IntField(pk=True)
+    user_id: int = fields.BigIntField()
+    kind: str = fields.CharField(max_length=10)
+    key: str = fields.TextField()
+    unique_owned: int = fields.IntField(default=0)
+    copies: int = fields.IntField(default=0)
+
+    class Meta:
+        table = "user_group_stats"
+        unique_together = ("user_id", "kind", "key")
+
 class TriviaSessionModel(Model):
     id = fields.IntField(pk=True)
     channel_id = fields.BigIntField()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from logging import getLogger
+from typing import Iterable
+
+import discord
+
+from .cache import LRUCache
+
+log = getLogger(__name__)
+
+__all__ = ("NameCache", "UNKNOWN_USER")
+
+UNKNOWN_USER = "Unknown User"
+
+
+class NameCache:
+    """Resolves user ids to names for leaderboards and embeds.
+
+    Lookups try the gateway caches first (guild members, then users), then
+    a bounded TTL cache, and only fetch what is still missing over REST,
+    at most `concurrency` requests at a time. discord.py already waits out
+    rate limit buckets, so the semaphore just keeps a big page from
+    queueing dozens of requests behind one bucket.
+    """
+
+    def __init__(self, client: discord.Client, *, ttl: float = 3600, maxsize: int = 5000, concurrency: int = 4) -> None:
+        self.client = client
+        self._cache: LRUCache[int, str] = LRUCache(maxsize, ttl=ttl)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def _local(self, user_id: int) -> str | None:
+        for guild in self.client.guilds:
+            member = guild.get_member(user_id)
+            if member is not None:
+                return member.name
+        user = self.client.get_user(user_id)
+        if user is not None:
+            return user.name
+        return self._cache.get(user_id)
+
+    async def _fetch(self, user_id: int) -> str | None:
+        async with self._semaphore:
+            try:
+                user = await self.client.fetch_user(user_id)
+            except discord.NotFound:
+                name = UNKNOWN_USER
+            except discord.HTTPException as e:
+                log.warning(f"Failed to fetch user {user_id}: {e}")
+                return None
+            else:
+                name = user.name
+        self._cache.set(user_id, name)
+        return name
+
+    async def resolve(self, user_ids: Iterable[int | str]) -> dict[int, str]:
+        """Names for every id, fetching all cache misses concurrently."""
+        names: dict[int, str] = {}
+        missing = []
+        for user_id in map(int, user_ids):
+            name = self._local(user_id)
+            if name is None:
+                missing.append(user_id)
+            else:
+                names[user_id] = name
+
+        if missing:
+            fetched = await asyncio.gather(*(self._fetch(user_id) for user_id in missing))
+            for user_id, name in zip(missing, fetched):
+                names[user_id] = name or UNKNOWN_USER
+        return names
+
+    async def get(self, user_id: int | str) -> str:
+        return (await self.resolve([user_id]))[int(user_id)]
+
+    def invalidate(self, user_id: int | str | None = None) -> None:
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(int(user_id))
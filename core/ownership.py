@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from tortoise import connections
+
+from .cache import LRUCache
+from .catalog import Catalog
+
+__all__ = ("Ownership",)
+
+
+class Ownership:
+    """Per-user bitmaps of owned objekts, indexed by catalog position.
+
+    A user's bitmap is built from one `SELECT objekt_id` and cached, so
+    completion and diff checks are `&`, `~` and `bit_count()` against
+    `Catalog.mask` with no joins. The inventory invalidates a user when
+    their collection changes and again after the change commits; a read
+    that overlapped any invalidation is returned but not cached. Bitmaps
+    built against an older catalog version are rebuilt on next access.
+    """
+
+    def __init__(self, catalog: Catalog, *, ttl: float = 1800, maxsize: int = 5000) -> None:
+        self.catalog = catalog
+        self._cache: LRUCache[int, tuple[int, int]] = LRUCache(maxsize, ttl=ttl)
+        self._generation = 0
+
+    async def get(self, user_id: int | str) -> int:
+        key = int(user_id)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == self.catalog.version:
+            return entry[1]
+
+        generation = self._generation
+        rows = await connections.get("default").execute_query_dict(
+            "SELECT objekt_id FROM collections WHERE user_id = $1", [key]
+        )
+        owned = self.catalog.bits(row["objekt_id"] for row in rows)
+        if generation == self._generation:
+            self._cache.set(key, (self.catalog.version, owned))
+        return owned
+
+    def invalidate(self, user_id: int | str | None = None) -> None:
+        self._generation += 1
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(int(user_id))
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Callable
+
+import discord
+from discord import app_commands
+from tortoise import connections
+
+from .cache import LRUCache
+from .models import RateLimitModel
+
+log = getLogger(__name__)
+
+__all__ = ("RateLimiter", "rate_limit")
+
+# a bucket with no stored state is already full
+_FULL = datetime.min.replace(tzinfo=timezone.utc)
+
+
+class RateLimiter:
+    """Token-bucket limits for app commands, persisted in `rate_limits`.
+
+    Buckets are tracked GCRA style: the only state per (user, command) is the
+    time at which the bucket is full again. Checks run against an in-memory
+    copy, so a hit costs no query once the bucket is warm; a bucket is read
+    from the table only on a local miss. Changed buckets are written back in
+    bulk every `flush_interval` seconds and on shutdown, so limits survive
+    restarts and reloads. Flushes keep the later of the stored and local
+    times, so processes sharing the table never shorten each other's limits,
+    though a limit only reaches another process once it is flushed.
+    """
+
+    def __init__(self, *, flush_interval: float = 30, ttl: float = 600, maxsize: int = 10_000) -> None:
+        self.flush_interval = flush_interval
+        self._buckets: LRUCache[tuple[int, str], datetime] = LRUCache(maxsize, ttl=ttl)
+        # unflushed buckets, kept apart so eviction never loses them
+        self._dirty: dict[tuple[int, str], datetime] = {}
+        self._task: asyncio.Task | None = None
+
+    def _peek(self, key: tuple[int, str]) -> datetime | None:
+        return self._dirty.get(key) or self._buckets.get(key)
+
+    async def hit(self, user_id: int | str, command: str, rate: int, per: float, cost: int = 1) -> float:
+        """Take `cost` tokens from a bucket of `rate` tokens refilling over `per` seconds.
+
+        Returns 0 if the command may run, otherwise the seconds to wait; a
+        rejected hit consumes nothing. A cost larger than the bucket is
+        allowed whenever a token is available and pushes the bucket into debt,
+        so a 10x multi-spin waits as long as ten single spins would.
+        """
+        key = (int(user_id), command)
+        full_at = self._peek(key)
+        if full_at is None:
+            row = await RateLimitModel.get_or_none(user_id=key[0], bucket=command)
+            # another hit may have loaded the bucket while this one waited
+            full_at = self._peek(key)
+            if full_at is None:
+                full_at = row.full_at if row else _FULL
+                self._buckets.set(key, full_at)
+
+        now = datetime.now(tz=timezone.utc)
+        interval = per / rate
+        if full_at > now:
+            # the bucket is short by (full_at - now) / interval tokens
+            retry_after = (full_at - now).total_seconds() - (per - interval)
+            if retry_after > 0:
+                return retry_after
+        else:
+            full_at = now
+
+        full_at += timedelta(seconds=interval * cost)
+        self._buckets.set(key, full_at)
+        self._dirty[key] = full_at
+        return 0.0
+
+    async def flush(self) -> int:
+        """Persist every changed bucket. Returns the number of rows written."""
+        if not self._dirty:
+            return 0
+        dirty, self._dirty = self._dirty, {}
+        try:
+            await connections.get("default").execute_query(
+                """
+                INSERT INTO rate_limits (user_id, bucket, full_at)
+                SELECT * FROM unnest($1::bigint[], $2::text[], $3::timestamptz[])
+                ON CONFLICT (user_id, bucket) DO UPDATE SET full_at = greatest(rate_limits.full_at, EXCLUDED.full_at)
+                """,
+                [[user for user, _ in dirty], [command for _, command in dirty], list(dirty.values())]
+            )
+        except Exception:
+            # keep anything that was not hit again in the meantime for the next attempt
+            for key, full_at in dirty.items():
+                self._dirty.setdefault(key, full_at)
+            raise
+        return len(dirty)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"Failed to flush rate limits: {e}")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+def rate_limit(
+    rate: int,
+    per: float,
+    *,
+    name: str | None = None,
+    cost: Callable[[discord.Interaction], int] | None = None
+):
+    """Persistent drop-in for `app_commands.checks.cooldown`, keyed by user.
+
+    Raises `app_commands.CommandOnCooldown` so existing error handlers keep
+    working. `cost` may derive the number of tokens from the interaction.
+    """
+    async def predicate(interaction: discord.Interaction) -> bool:
+        command = name or interaction.command.qualified_name
+        tokens = cost(interaction) if cost else 1
+        retry_after = await interaction.client.ratelimits.hit(interaction.user.id, command, rate, per, tokens)
+        if retry_after:
+            raise app_commands.CommandOnCooldown(app_commands.Cooldown(rate, per), retry_after)
+        return True
+
+    return app_commands.check(predicate)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from logging import getLogger
+from typing import NamedTuple
+
+from PIL import Image
+
+from .cache import LRUCache
+from .catalog import Catalog
+
+log = getLogger(__name__)
+
+__all__ = ("CollageSpec", "RenderPool", "RenderCache", "render_collage")
+
+
+class CollageSpec(NamedTuple):
+    """Everything needed to draw one collage, safe to send to another process.
+
+    Tiles are RGBA thumbnails, either decoded images (which pickle as raw
+    pixel data) or encoded image bytes, each with its top-left corner.
+    With `masked` the tiles' alpha is used as the paste mask.
+    """
+
+    size: tuple[int, int]
+    background: tuple[int, int, int, int]
+    tiles: list[tuple[Image.Image | bytes, tuple[int, int]]]
+    masked: bool = False
+
+
+def render_collage(spec: CollageSpec) -> bytes:
+    """Composite a collage and encode it as PNG."""
+    collage = Image.new("RGBA", spec.size, spec.background)
+    for tile, position in spec.tiles:
+        if isinstance(tile, bytes):
+            tile = Image.open(BytesIO(tile)).convert("RGBA")
+        collage.paste(tile, position, mask=tile.split()[3] if spec.masked else None)
+    buffer = BytesIO()
+    collage.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class RenderPool:
+    """Runs collage rendering off the event loop.
+
+    PIL work is CPU bound and holds the GIL for most of a render, so by
+    default it runs in a pool of worker processes; where processes are not
+    available, or the pool breaks, it falls back to threads, which still
+    keep the loop free to answer the gateway and other commands.
+
+    `stats()` reports queue depth (renders submitted but not finished),
+    its high-water mark and render timings.
+    """
+
+    def __init__(self, workers: int = 2, *, processes: bool = True) -> None:
+        self.workers = workers
+        self.processes = processes
+        self._executor: Executor | None = None
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.processes:
+                try:
+                    # spawn avoids forking a process that is running an event loop
+                    self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+                except (ImportError, NotImplementedError, OSError) as e:
+                    log.warning(f"Process render pool unavailable, using threads: {e}")
+                    self.processes = False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="render")
+        return self._executor
+
+    def _fall_back(self) -> None:
+        log.warning("Process render pool broke, falling back to threads.")
+        executor, self._executor = self._executor, None
+        self.processes = False
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def render(self, spec: CollageSpec) -> bytes:
+        """The PNG-encoded collage for `spec`."""
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        started = time.perf_counter()
+        try:
+            try:
+                data = await loop.run_in_executor(self.executor, render_collage, spec)
+            except BrokenProcessPool:
+                self._fall_back()
+                data = await loop.run_in_executor(self.executor, render_collage, spec)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.seconds += time.perf_counter() - started
+        return data
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "workers": self.workers,
+            "processes": int(self.processes),
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_ms": round(self.seconds / self.completed * 1000, 1) if self.completed else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class RenderCache:
+    """Encoded collages, bounded by total bytes and evicted LRU.
+
+    Keys hash the catalog version together with everything that affects
+    the pixels (collage kind, grid, background, tile URLs), so a catalog
+    reload or an edited image never serves an old render; `invalidate`
+    also drops the stale entries at once instead of waiting for them to
+    age out.
+    """
+
+    def __init__(self, catalog: Catalog, *, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.catalog = catalog
+        self._cache: LRUCache[str, bytes] = LRUCache(None, max_bytes=max_bytes, sizeof=len)
+
+    def key(self, *params) -> str:
+        return hashlib.sha256(repr((self.catalog.version, params)).encode()).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, data: bytes) -> None:
+        self._cache.set(key, data)
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import random
+from logging import getLogger
+from typing import Generic, Sequence, TypeVar
+
+from .catalog import Catalog, ObjektRecord
+from .constants import SPIN_RARITY_WEIGHTS, RATEUP_SEASON, FILLER_SEASON, FILLER_SEASON_WEIGHT
+
+log = getLogger(__name__)
+
+__all__ = ("AliasTable", "SpinSampler", "banner_seasons")
+
+T = TypeVar("T")
+
+
+class AliasTable(Generic[T]):
+    """Walker/Vose alias table: O(n) to build, O(1) per draw."""
+
+    __slots__ = ("items", "prob", "alias")
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float]) -> None:
+        if len(items) != len(weights):
+            raise ValueError("items and weights must be the same length")
+        total = float(sum(weights))
+        if not items or total <= 0:
+            raise ValueError("cannot build an alias table without positive weights")
+
+        n = len(items)
+        scaled = [weight * n / total for weight in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        # whatever is left is 1.0 up to float error
+        for i in small + large:
+            prob[i] = 1.0
+
+        self.items = list(items)
+        self.prob = prob
+        self.alias = alias
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def draw(self, rng: random.Random | None = None) -> T:
+        u = (rng or random).random() * len(self.items)
+        i = int(u)
+        return self.items[i] if u - i < self.prob[i] else self.items[self.alias[i]]
+
+
+def banner_seasons(banner: str | None, rarity: int) -> list[tuple[str | None, float]]:
+    """Season split for a banner at a given rarity; `None` means every season."""
+    if not banner:
+        return [(None, 1.0)]
+    season = RATEUP_SEASON if banner == "rateup" else banner
+    if rarity == 1:
+        return [(season, 1.0 - FILLER_SEASON_WEIGHT), (FILLER_SEASON, FILLER_SEASON_WEIGHT)]
+    return [(season, 1.0)]
+
+
+class SpinSampler:
+    """Precompiled per-banner spin tables over the final objekt distribution.
+
+    Each table folds rarity -> season -> objekt into one alias table, so a
+    spin is a single draw. Tables are rebuilt lazily whenever the catalog
+    version moves on. Rarity or season buckets with no objekts are dropped
+    and the remaining weights renormalised.
+    """
+
+    def __init__(self, catalog: Catalog, rarity_weights: dict[int, float] = SPIN_RARITY_WEIGHTS) -> None:
+        self.catalog = catalog
+        self.rarity_weights = rarity_weights
+        self._tables: dict[str | None, AliasTable[ObjektRecord] | None] = {}
+        self._version = catalog.version
+
+    def invalidate(self) -> None:
+        self._tables.clear()
+
+    def _build(self, banner: str | None) -> AliasTable[ObjektRecord] | None:
+        weights: dict[int, float] = {}
+        for rarity, rarity_weight in self.rarity_weights.items():
+            for season, season_weight in banner_seasons(banner, rarity):
+                objekts = self.catalog.with_rarity(rarity, season)
+                if not objekts:
+                    continue
+                share = rarity_weight * season_weight / len(objekts)
+                for objekt in objekts:
+                    weights[objekt.id] = weights.get(objekt.id, 0.0) + share
+
+        if not weights:
+            return None
+        table = AliasTable([self.catalog.by_id[i] for i in weights], list(weights.values()))
+        log.info(f"Built spin table for banner {banner or 'all'} ({len(table)} objekts).")
+        return table
+
+    def table(self, banner: str | None) -> AliasTable[ObjektRecord] | None:
+        if self._version != self.catalog.version:
+            self._tables.clear()
+            self._version = self.catalog.version
+        if banner not in self._tables:
+            self._tables[banner] = self._build(banner)
+        return self._tables[banner]
+
+    def draw(self, banner: str | None = None, rng: random.Random | None = None) -> ObjektRecord | None:
+        table = self.table(banner)
+        return table.draw(rng) if table else None
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from datetime import date, datetime, timezone
+from logging import getLogger
+
+from tortoise import connections
+from tortoise.transactions import in_transaction
+
+from .cache import LRUCache
+from .catalog import Catalog, ObjektRecord
+from .constants import RARITY_TIERS, SHOP_BUY_VALUES, SHOP_MODE
+from .inventory import Inventory
+from .ledger import Ledger
+from .models import ShopStateModel
+
+log = getLogger(__name__)
+
+__all__ = ("Shop", "ShopItem", "Purchase", "SHOP_SIZE")
+
+SHOP_SIZE = 6
+
+
+class ShopItem:
+    __slots__ = ("slot", "objekt", "price")
+
+    def __init__(self, slot: int, objekt: ObjektRecord, price: int) -> None:
+        self.slot = slot
+        self.objekt = objekt
+        self.price = price
+
+
+class Purchase:
+    """Outcome of `Shop.purchase`: status is "ok", "duplicate" or "insufficient"."""
+    __slots__ = ("status", "balance", "copies")
+
+    def __init__(self, status: str, balance: int | None = None, copies: int | None = None) -> None:
+        self.status = status
+        self.balance = balance
+        self.copies = copies
+
+
+def _today() -> date:
+    return datetime.now(tz=timezone.utc).date()
+
+
+class Shop:
+    """Daily per-user shops of `SHOP_SIZE` random objekts.
+
+    In "lazy" mode a shop is derived on first view from a seed of
+    (user_id, UTC date) against the catalog, so nothing is written until
+    something is bought. In "nightly" mode `rebuild` materializes every
+    user's shop into the `shop` table. Either way the resolved items are
+    cached per user for the day. `reroll` salts the lazy seed so every
+    shop is redrawn; the salt is stored with the UTC date it applies to,
+    so it survives restarts and lapses at midnight.
+    """
+
+    def __init__(self, catalog: Catalog, *, mode: str = SHOP_MODE, chunk_size: int = 5000, maxsize: int = 10_000) -> None:
+        self.catalog = catalog
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self._cache: LRUCache[tuple[int, date], list[ShopItem]] = LRUCache(maxsize)
+        self.salt = 0
+        self.salt_day: date | None = None
+
+    @property
+    def lazy(self) -> bool:
+        return self.mode == "lazy"
+
+    def generate(self, user_id: int | str, day: date) -> list[ShopItem]:
+        """The deterministic shop for a user on a given day."""
+        # string seeds hash the same in every process, unlike hash()
+        seed = f"{int(user_id)}:{day.isoformat()}"
+        salt = self.salt if day == self.salt_day else 0
+        rng = random.Random(f"{seed}:{salt}" if salt else seed)
+        return [ShopItem(slot, objekt, price) for slot, (objekt, price) in enumerate(self.roll(rng), start=1)]
+
+    async def items(self, user_id: int | str) -> list[ShopItem]:
+        day = _today()
+        key = (int(user_id), day)
+        items = self._cache.get(key)
+        if items is None:
+            if self.lazy:
+                items = self.generate(user_id, day)
+            else:
+                rows = await connections.get("default").execute_query_dict(
+                    "SELECT objekt_id, price FROM shop WHERE user_id = $1 ORDER BY id",
+                    [int(user_id)]
+                )
+                items = [
+                    ShopItem(slot, self.catalog.get(row["objekt_id"]), row["price"])
+                    for slot, row in enumerate(rows, start=1)
+                    if self.catalog.get(row["objekt_id"])
+                ]
+            self._cache.set(key, items)
+        return items
+
+    async def view(self, user_id: int | str) -> list[tuple[ShopItem, int]]:
+        """A user's shop with how many copies of each item they own, in one query."""
+        connection = connections.get("default")
+        if self.lazy:
+            items = await self.items(user_id)
+            if not items:
+                return []
+            rows = await connection.execute_query_dict(
+                "SELECT objekt_id, copies FROM collections WHERE user_id = $1 AND objekt_id = ANY($2::int[])",
+                [int(user_id), [item.objekt.id for item in items]]
+            )
+            owned = {row["objekt_id"]: row["copies"] for row in rows}
+            return [(item, owned.get(item.objekt.id, 0)) for item in items]
+
+        rows = await connection.execute_query_dict(
+            """
+            SELECT s.objekt_id, s.price, COALESCE(c.copies, 0) AS owned
+            FROM shop AS s
+            LEFT JOIN collections AS c ON c.user_id = s.user_id AND c.objekt_id = s.objekt_id
+            WHERE s.user_id = $1
+            ORDER BY s.id
+            """,
+            [int(user_id)]
+        )
+        result = []
+        for row in rows:
+            objekt = self.catalog.get(row["objekt_id"])
+            if objekt:
+                result.append((ShopItem(len(result) + 1, objekt, row["price"]), row["owned"]))
+        return result
+
+    async def purchase(self, user_id: int | str, item: ShopItem, key: str, *, ledger: Ledger, inventory: Inventory) -> Purchase:
+        """Charge for and grant one shop item in a single transaction.
+
+        `key` identifies one purchase from a shop button; a key that was
+        already used (a double click) is reported as a duplicate without
+        charging again.
+        """
+        async with inventory.transaction() as connection:
+            rows = await connection.execute_query_dict(
+                """
+                INSERT INTO shop_purchases (user_id, objekt_id, price, idempotency_key, created_at)
+                VALUES ($1, $2, $3, $4, now())
+                ON CONFLICT (idempotency_key) DO NOTHING
+                RETURNING id
+                """,
+                [int(user_id), item.objekt.id, item.price, key]
+            )
+            if not rows:
+                return Purchase("duplicate")
+
+            balance = await ledger.debit(user_id, item.price, using_db=connection)
+            if balance is None:
+                # free the key so the button works once they can afford it
+                await connection.execute_query("DELETE FROM shop_purchases WHERE id = $1", [rows[0]["id"]])
+                return Purchase("insufficient")
+
+            copies = await inventory.add(user_id, item.objekt.id, using_db=connection)
+        return Purchase("ok", balance, copies)
+
+    def invalidate(self, user_id: int | str | None = None) -> None:
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop((int(user_id), _today()))
+
+    async def load(self) -> None:
+        """Read the stored reroll salt."""
+        state = await ShopStateModel.get_or_none(id=1)
+        if state is not None:
+            self.salt, self.salt_day = state.salt, state.day
+
+    async def reroll(self) -> None:
+        """Draw a new lazy shop for everyone, replacing today's."""
+        day = _today()
+        rows = await connections.get("default").execute_query_dict(
+            """
+            INSERT INTO shop_state (id, day, salt) VALUES (1, $1, 1)
+            ON CONFLICT (id) DO UPDATE SET
+                salt = CASE WHEN shop_state.day = EXCLUDED.day THEN shop_state.salt + 1 ELSE 1 END,
+                day = EXCLUDED.day
+            RETURNING salt
+            """,
+            [day]
+        )
+        self.salt, self.salt_day = rows[0]["salt"], day
+        self.invalidate()
+
+    def roll(self, rng: random.Random | None = None) -> list[tuple[ObjektRecord, int]]:
+        """Pick a shop's worth of `(objekt, price)` pairs from the catalog."""
+        rng = rng or random
+        items = []
+        for _ in range(SHOP_SIZE):
+            objekt = self.catalog.random_by_rarity(rng.choice(RARITY_TIERS), rng)
+            if objekt:
+                items.append((objekt, SHOP_BUY_VALUES.get(objekt.rarity, 0)))
+        return items
+
+    async def rebuild(self) -> dict[str, float]:
+        """Replace every user's shop in one transaction.
+
+        All items are sampled in memory and written with one multi-row insert
+        per `chunk_size` users. Returns user/row counts and phase timings.
+        """
+        started = time.perf_counter()
+        rows = await connections.get("default").execute_query_dict("SELECT id FROM economy")
+        user_ids = [row["id"] for row in rows]
+        loaded = time.perf_counter()
+
+        inserted = 0
+        async with in_transaction() as connection:
+            await connection.execute_query("DELETE FROM shop")
+            for start in range(0, len(user_ids), self.chunk_size):
+                users, objekts, prices = [], [], []
+                for user_id in user_ids[start:start + self.chunk_size]:
+                    for objekt, price in self.roll():
+                        users.append(user_id)
+                        objekts.append(objekt.id)
+                        prices.append(price)
+                if users:
+                    await connection.execute_query(
+                        """
+                        INSERT INTO shop (user_id, objekt_id, price, created_at)
+                        SELECT t.user_id, t.objekt_id, t.price, now()
+                        FROM unnest($1::bigint[], $2::int[], $3::int[]) AS t(user_id, objekt_id, price)
+                        """,
+                        [users, objekts, prices]
+                    )
+                    inserted += len(users)
+                # let other handlers run between chunks
+                await asyncio.sleep(0)
+        self.invalidate()
+
+        finished = time.perf_counter()
+        stats = {
+            "users": len(user_ids),
+            "rows": inserted,
+            "load_seconds": round(loaded - started, 3),
+            "write_seconds": round(finished - loaded, 3),
+            "total_seconds": round(finished - started, 3),
+        }
+        log.info(
+            f"Rebuilt shop: {stats['rows']} rows for {stats['users']} users in {stats['total_seconds']}s "
+            f"(load {stats['load_seconds']}s, sample+write {stats['write_seconds']}s)."
+        )
+        return stats
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from io import BytesIO
+from logging import getLogger
+from typing import Iterable
+
+from PIL import Image
+
+from .cache import LRUCache
+from .images import ImageFetcher
+
+log = getLogger(__name__)
+
+__all__ = ("ThumbnailCache",)
+
+Size = tuple[int, int]
+
+
+def _key(url: str, size: Size) -> str:
+    return hashlib.sha256(f"{url}|{size[0]}x{size[1]}".encode()).hexdigest()
+
+
+class ThumbnailCache:
+    """Pre-resized objekt images, on disk and in memory.
+
+    Thumbnails are stored as `<sha256(url|size)>.png` with a small JSON
+    sidecar holding the source URL's ETag/Last-Modified and when it was
+    last checked. The directory is kept under `max_bytes` by evicting the
+    least recently used entries, and the most recently used decoded images
+    stay in a hot in-memory tier, so a warm collage does no network or
+    disk I/O at all.
+
+    Entries older than `revalidate_after` seconds are revalidated with a
+    conditional GET; a 304 just refreshes the check time, and if the CDN is
+    unreachable the stale thumbnail is served.
+    """
+
+    def __init__(
+        self,
+        fetcher: ImageFetcher,
+        *,
+        directory: str = os.path.join("collage", "thumbs"),
+        max_bytes: int = 256 * 1024 * 1024,
+        revalidate_after: float = 86400,
+        hot_size: int = 512,
+        hot_bytes: int = 64 * 1024 * 1024
+    ) -> None:
+        self.fetcher = fetcher
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self._hot: LRUCache[str, Image.Image] = LRUCache(
+            hot_size,
+            ttl=revalidate_after,
+            max_bytes=hot_bytes,
+            sizeof=lambda image: image.width * image.height * len(image.getbands())
+        )
+        # key -> bytes on disk, least recently used first
+        self._disk: OrderedDict[str, int] | None = None
+        self._bytes = 0
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}.{suffix}")
+
+    def _scan(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                key = entry.name[:-4]
+                stat = entry.stat()
+                sidecar = self._path(key, "json")
+                size = stat.st_size + (os.path.getsize(sidecar) if os.path.exists(sidecar) else 0)
+                entries.append((stat.st_mtime, key, size))
+        self._disk = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._bytes = sum(self._disk.values())
+
+    def _remember(self, key: str, size: int) -> None:
+        self._bytes += size - self._disk.pop(key, 0)
+        self._disk[key] = size
+        while self._bytes > self.max_bytes and len(self._disk) > 1:
+            old, old_size = self._disk.popitem(last=False)
+            self._bytes -= old_size
+            for suffix in ("png", "json"):
+                try:
+                    os.remove(self._path(old, suffix))
+                except FileNotFoundError:
+                    pass
+
+    def _touch(self, key: str) -> None:
+        # the key may have been evicted by another load while this one awaited
+        if key in self._disk:
+            self._disk.move_to_end(key)
+
+    def _read(self, key: str) -> tuple[Image.Image, dict] | None:
+        try:
+            with open(self._path(key, "json")) as f:
+                meta = json.load(f)
+            with Image.open(self._path(key, "png")) as img:
+                img.load()
+                image = img.copy()
+            os.utime(self._path(key, "png"))
+        except (OSError, ValueError) as e:
+            log.warning(f"Discarding unreadable thumbnail {key}: {e}")
+            return None
+        return image, meta
+
+    def _write(self, key: str, data: bytes, size: Size, meta: dict) -> tuple[Image.Image, int]:
+        with Image.open(BytesIO(data)) as img:
+            image = img.convert("RGBA")
+        image.thumbnail(size)
+        png = self._path(key, "png")
+        image.save(f"{png}.tmp", format="PNG")
+        os.replace(f"{png}.tmp", png)
+        return image, os.path.getsize(png) + self._write_meta(key, meta)
+
+    def _write_meta(self, key: str, meta: dict) -> int:
+        path = self._path(key, "json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{path}.tmp", path)
+        return os.path.getsize(path)
+
+    async def _load(self, url: str, size: Size, key: str) -> Image.Image | None:
+        if self._disk is None:
+            await asyncio.to_thread(self._scan)
+
+        cached = await asyncio.to_thread(self._read, key) if key in self._disk else None
+        if cached is not None:
+            image, meta = cached
+            if time.time() - meta.get("checked_at", 0) < self.revalidate_after:
+                self._touch(key)
+                return image
+            headers = {}
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            response = await self.fetcher.get(url, headers)
+            if response is None or response.status == 304:
+                # unchanged, or the CDN is down and stale beats nothing
+                if response is not None and key in self._disk:
+                    meta["checked_at"] = time.time()
+                    await asyncio.to_thread(self._write_meta, key, meta)
+                self._touch(key)
+                return image
+        else:
+            response = await self.fetcher.get(url)
+            if response is None or response.body is None:
+                return None
+
+        meta = {
+            "url": url,
+            "etag": response.etag,
+            "last_modified": response.last_modified,
+            "checked_at": time.time()
+        }
+        try:
+            image, stored = await asyncio.to_thread(self._write, key, response.body, size, meta)
+        except OSError as e:
+            log.warning(f"Error loading image from {url}: {e}")
+            return None
+        self._remember(key, stored)
+        return image
+
+    async def get(self, url: str | None, size: Size) -> Image.Image | None:
+        """An RGBA thumbnail of `url` fitted inside `size`, or None if it cannot be loaded."""
+        if not url:
+            return None
+        key = _key(url, size)
+        image = self._hot.get(key)
+        if image is not None:
+            return image
+
+        # concurrent requests for the same thumbnail share one load
+        pending = self._pending.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # the loading request was cancelled, not this one
+                return None
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            image = await self._load(url, size, key)
+        except Exception as e:
+            # a bad entry should cost one blank tile, not the whole collage
+            log.exception(f"Error loading thumbnail for {url}: {e}")
+            image = None
+            future.set_result(None)
+        else:
+            future.set_result(image)
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._pending[key]
+
+        if image is not None:
+            self._hot.set(key, image)
+        return image
+
+    async def get_many(self, urls: Iterable[str | None], size: Size) -> list[Image.Image | None]:
+        """Thumbnails for every url, in order, loaded concurrently."""
+        return list(await asyncio.gather(*(self.get(url, size) for url in urls)))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hot": len(self._hot),
+            "disk_entries": len(self._disk or ()),
+            "disk_bytes": self._bytes,
+        }